@@ -0,0 +1,67 @@
+# Bounded TTL/LRU cache of resolved users, keyed by session token or JWT
+# Lets get_current_user skip the user_sessions/users lookups for repeat requests.
+
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, Optional, Set, Tuple
+
+
+class UserCache:
+    """Token -> (user, expiry) cache.
+
+    An entry lives for at most ``ttl`` seconds and never past the session or token
+    expiry. Invalidation is per process, so ``ttl`` bounds how stale another worker's
+    view of a user (e.g. after a language change) can be.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 60.0):
+        self._max_entries = max_entries
+        self._ttl = ttl
+        # token -> (user, session expiry, monotonic deadline)
+        self._entries: "OrderedDict[str, Tuple[dict, datetime, float]]" = OrderedDict()
+        self._tokens_by_user: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, token: str) -> Optional[dict]:
+        entry = self._entries.get(token)
+        if entry is None:
+            return None
+        user, expires_at, deadline = entry
+        if time.monotonic() >= deadline or expires_at <= datetime.now(timezone.utc):
+            self.invalidate_token(token)
+            return None
+        self._entries.move_to_end(token)
+        # Handlers get their own copy so they cannot mutate the cached user
+        return dict(user)
+
+    def put(self, token: str, user: dict, expires_at: datetime) -> None:
+        if self._ttl <= 0 or self._max_entries <= 0:
+            return
+        self.invalidate_token(token)
+        self._entries[token] = (dict(user), expires_at, time.monotonic() + self._ttl)
+        self._tokens_by_user.setdefault(user["user_id"], set()).add(token)
+        while len(self._entries) > self._max_entries:
+            oldest, _ = next(iter(self._entries.items()))
+            self.invalidate_token(oldest)
+
+    def invalidate_token(self, token: str) -> None:
+        entry = self._entries.pop(token, None)
+        if entry is None:
+            return
+        user_id = entry[0]["user_id"]
+        tokens = self._tokens_by_user.get(user_id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[user_id]
+
+    def invalidate_user(self, user_id: str) -> None:
+        for token in list(self._tokens_by_user.get(user_id, ())):
+            self.invalidate_token(token)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._tokens_by_user.clear()
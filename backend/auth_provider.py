@@ -0,0 +1,147 @@
+# Pooled client for the OAuth session-data exchange with the auth provider
+# One app-lifetime httpx client keeps connections alive across logins; failed calls are
+# retried a few times with jittered backoff, and a circuit breaker fails fast while the
+# provider is down instead of tying up every login for the full timeout.
+
+import asyncio
+import importlib.util
+import logging
+import random
+import time
+from typing import Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class AuthProviderUnavailable(Exception):
+    pass
+
+
+class CircuitBreaker:
+    """Opens after ``failure_threshold`` consecutive failures; after ``reset_timeout``
+    seconds a single trial call is let through (half-open) to probe for recovery.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """End a trial call that neither succeeded nor failed (e.g. a cancelled request)."""
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._trial_in_flight = False
+        if self._opened_at is not None or self._failures >= self.failure_threshold:
+            if self._opened_at is None:
+                logger.warning(f"Auth provider circuit opened after {self._failures} failures")
+            self._opened_at = time.monotonic()
+
+
+class SessionExchangeClient:
+    def __init__(
+        self,
+        url: str,
+        connect_timeout: float = 3.0,
+        read_timeout: float = 10.0,
+        retries: int = 2,
+        backoff: float = 0.2,
+        max_connections: int = 20,
+        breaker: Optional[CircuitBreaker] = None
+    ):
+        self.url = url
+        self.retries = retries
+        self.backoff = backoff
+        self.breaker = breaker or CircuitBreaker()
+        self._timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self._limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # Created on first use as well, for app instances that never ran their startup hooks
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=self._timeout, limits=self._limits, http2=HTTP2_AVAILABLE)
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def fetch_session_data(self, session_id: str) -> Optional[dict]:
+        """User data for ``session_id``; ``None`` when the provider rejects the session.
+
+        Raises AuthProviderUnavailable when the circuit is open or every attempt failed.
+        """
+        if not self.breaker.allow():
+            raise AuthProviderUnavailable("Auth provider circuit open")
+
+        last_error: Optional[Exception] = None
+        try:
+            for attempt in range(self.retries + 1):
+                if attempt:
+                    # Full jitter keeps concurrent logins from retrying in lockstep
+                    await asyncio.sleep(random.uniform(0, self.backoff * 2 ** (attempt - 1)))
+                try:
+                    response = await self.client.get(self.url, headers={"X-Session-ID": session_id})
+                except httpx.TransportError as e:
+                    last_error = e
+                    continue
+                except httpx.HTTPError as e:
+                    # Undecodable body, redirect loop...: a retry would fail the same way
+                    last_error = e
+                    break
+                if response.status_code >= 500 or response.status_code == 429:
+                    last_error = httpx.HTTPStatusError(
+                        f"Auth provider returned {response.status_code}", request=response.request, response=response
+                    )
+                    continue
+
+                self.breaker.record_success()
+                if response.status_code != 200:
+                    return None
+                try:
+                    return response.json()
+                except ValueError:
+                    return None
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        finally:
+            # A cancelled half-open trial must not keep the circuit shut for everyone else
+            self.breaker.release_trial()
+
+        self.breaker.record_failure()
+        logger.error(f"Auth provider unavailable after {self.retries + 1} attempts: {last_error}")
+        raise AuthProviderUnavailable(str(last_error))
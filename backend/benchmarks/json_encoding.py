@@ -0,0 +1,91 @@
+# Micro-benchmark: stdlib JSONResponse vs orjson FastJSONResponse on real catalog payloads
+# Payloads come from the seed data (no database needed), plus synthetic tasting notes for
+# the datetime-heavy path.
+#
+# Usage (from backend/):  python benchmarks/json_encoding.py [--repeat 5] [--number 50]
+
+import argparse
+import os
+import sys
+import timeit
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+# server is only imported for its response models; Motor does not connect until first use
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "winestudy_benchmark")
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+from catalog_snapshot import load_seed_data  # noqa: E402
+from json_response import FastJSONResponse  # noqa: E402
+from server import GrapeResponse, LessonResponse, RegionResponse, TastingNoteResponse  # noqa: E402
+
+
+def tasting_notes(count: int = 200):
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "tasting_id": f"tasting_{uuid.uuid4().hex[:12]}",
+            "user_id": f"user_{uuid.uuid4().hex[:12]}",
+            "wine_name": f"Wine {i}",
+            "vintage": 2000 + i % 20,
+            "grape_ids": ["cabernet_sauvignon", "merlot"],
+            "appearance": {"clarity": "clear", "intensity": "deep", "color": "ruby"},
+            "nose": {"condition": "clean", "intensity": "pronounced", "aromas": ["Cherry", "Vanilla"]},
+            "palate": {"sweetness": "dry", "acidity": "medium+", "tannin": "high", "body": "full"},
+            "conclusion": {"quality": "very good", "readiness": "can drink now"},
+            "created_at": now - timedelta(days=i),
+        }
+        for i in range(count)
+    ]
+
+
+def payloads():
+    data = load_seed_data()
+    lessons = data["base_lessons"] + data["intermediate_lessons"] + data["advanced_lessons"] + data["advanced_extra_lessons"]
+    # name -> (payload, response model of the route serving it)
+    return {
+        "grapes (81)": (data["complete_grapes"], List[GrapeResponse]),
+        "regions": (data["complete_regions"], List[RegionResponse]),
+        "lessons": (lessons, List[LessonResponse]),
+        "tastings (200)": (tasting_notes(), List[TastingNoteResponse]),
+    }
+
+
+ENCODERS = {
+    # What FastAPI does by default for a dict/list return value
+    "stdlib JSONResponse": lambda p, a: JSONResponse.render(None, jsonable_encoder(p)),
+    # Default response class after the switch; jsonable_encoder still runs for response_model routes
+    "orjson + jsonable_encoder": lambda p, a: FastJSONResponse.render(None, jsonable_encoder(p)),
+    # Validated and encoded by pydantic in one pass (GET /tastings, catalog response build)
+    "pydantic validate+dump_json": lambda p, a: a.dump_json(a.validate_python(p)),
+    # Handlers returning FastJSONResponse directly (/search, projected /tastings)
+    "orjson direct": lambda p, a: FastJSONResponse.render(None, p),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--number", type=int, default=50)
+    args = parser.parse_args()
+
+    for name, (payload, model) in payloads().items():
+        adapter = TypeAdapter(model)
+        size = len(FastJSONResponse.render(None, payload))
+        print(f"\n{name}: {size / 1024:.1f} KiB")
+        baseline = None
+        for encoder_name, encode in ENCODERS.items():
+            best = min(timeit.repeat(lambda: encode(payload, adapter), repeat=args.repeat, number=args.number)) / args.number
+            baseline = baseline or best
+            print(f"  {encoder_name:<28} {best * 1000:8.3f} ms  x{baseline / best:5.1f}")
+
+
+if __name__ == "__main__":
+    main()
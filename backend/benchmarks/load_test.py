@@ -0,0 +1,440 @@
+# Load test for the WineStudy API: mixed workload, per-endpoint throughput and latency
+# Starts the API locally (uvicorn subprocess) on a throwaway MongoDB database, on PostgreSQL,
+# or on the in-memory storage engine, seeds it, and drives catalog browsing, search,
+# tasting notes and quiz answering from concurrent simulated students. Running the same
+# workload against each engine compares them under identical load.
+#
+# Usage (from backend/):
+#   python benchmarks/load_test.py run --mongo-url mongodb://localhost:27017 --output before.json
+#   python benchmarks/load_test.py run --in-memory --duration 20 --concurrency 32
+#   python benchmarks/load_test.py run --postgres-url postgresql://localhost/winestudy_bench
+#   python benchmarks/load_test.py run --base-url http://localhost:8001   # already running server
+#   python benchmarks/load_test.py compare before.json after.json [--threshold 10]
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+SEED_ENDPOINTS = ["/seed", "/seed/expand", "/seed/grapes-complete", "/seed/expand-advanced", "/seed/regions-complete"]
+SEARCH_TERMS = ["bordeaux", "pinot", "cabernet", "riesling", "douro", "cherry", "terroir", "rodano", "malbec", "tanino"]
+SUGGEST_PREFIXES = ["ca", "mer", "pin", "sauv", "bord", "rio", "tem", "shir", "zinf", "chard"]
+PERCENTILES = (50, 95, 99)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# ======================== SERVER ========================
+
+def storage_engine(args) -> str:
+    if args.in_memory:
+        return "memory"
+    return "postgres" if args.postgres_url else "mongo"
+
+
+class LocalServer:
+    def __init__(self, storage: str, workers: int, mongo_url: Optional[str] = None, postgres_url: Optional[str] = None):
+        self.port = free_port()
+        self.base_url = f"http://127.0.0.1:{self.port}"
+        self.db_name = f"winestudy_loadtest_{uuid.uuid4().hex[:8]}"
+        self.storage = storage
+        # Every worker process would have its own in-memory state
+        self.workers = 1 if storage == "memory" else workers
+        self.mongo_url = mongo_url
+        self.postgres_url = postgres_url
+        self.process: Optional[subprocess.Popen] = None
+
+    def start(self) -> None:
+        env = {**os.environ, "STORAGE_BACKEND": self.storage, "PROFILING_ENABLED": ""}
+        if self.storage == "mongo":
+            env.update({"MONGO_URL": self.mongo_url, "DB_NAME": self.db_name})
+        elif self.storage == "postgres":
+            env["DATABASE_URL"] = self.postgres_url
+        command = [
+            sys.executable, "-m", "uvicorn", "server:app", "--host", "127.0.0.1", "--port", str(self.port),
+            "--workers", str(self.workers), "--log-level", "warning",
+        ]
+        self.process = subprocess.Popen(command, cwd=BACKEND_DIR, env=env)
+
+    async def wait_ready(self, timeout: float = 30.0) -> None:
+        deadline = time.monotonic() + timeout
+        async with httpx.AsyncClient(base_url=self.base_url) as client:
+            while time.monotonic() < deadline:
+                if self.process.poll() is not None:
+                    raise RuntimeError(f"Server exited with code {self.process.returncode}")
+                try:
+                    if (await client.get("/api/")).status_code == 200:
+                        return
+                except httpx.TransportError:
+                    pass
+                await asyncio.sleep(0.2)
+        raise RuntimeError("Server did not become ready")
+
+    def stop(self) -> None:
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        if self.storage == "mongo":
+            # The benchmark database is throwaway
+            from pymongo import MongoClient
+            with MongoClient(self.mongo_url, serverSelectionTimeoutMS=2000) as client:
+                client.drop_database(self.db_name)
+
+
+# ======================== WORKLOAD ========================
+
+class Recorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.recording = False
+
+    def record(self, name: str, seconds: float, status: str) -> None:
+        if not self.recording:
+            return
+        self.latencies[name].append(seconds)
+        self.statuses[name][status] += 1
+
+
+class Student:
+    """One simulated user; every operation is named after the route it exercises."""
+
+    def __init__(self, client: httpx.AsyncClient, recorder: Recorder, catalog: dict, token: str, rng: random.Random):
+        self.client = client
+        self.recorder = recorder
+        self.catalog = catalog
+        self.auth = {"Authorization": f"Bearer {token}"}
+        self.rng = rng
+        self.tasting_ids: List[str] = []
+        self.operations = [
+            # (weight, operation)
+            (15, self.browse_grapes), (6, self.filter_grapes), (8, self.grape_detail),
+            (6, self.browse_regions), (6, self.region_detail), (3, self.browse_countries), (4, self.browse_aromas),
+            (4, self.study_tracks), (5, self.track_lessons), (5, self.lesson_detail),
+            (8, self.search), (8, self.suggest),
+            (5, self.create_tasting), (6, self.list_tastings), (2, self.tasting_detail),
+            (4, self.quiz_questions), (6, self.submit_answer), (3, self.me),
+        ]
+        self._weights = [weight for weight, _ in self.operations]
+
+    async def call(self, name: str, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError as e:
+            self.recorder.record(name, time.perf_counter() - started, type(e).__name__)
+            return None
+        self.recorder.record(name, time.perf_counter() - started, str(response.status_code))
+        return response
+
+    def pick(self, collection: str) -> str:
+        return self.rng.choice(self.catalog[collection])
+
+    async def step(self) -> None:
+        operation = self.rng.choices(self.operations, weights=self._weights)[0][1]
+        await operation()
+
+    async def browse_grapes(self):
+        await self.call("GET /grapes", "GET", "/api/grapes")
+
+    async def filter_grapes(self):
+        await self.call("GET /grapes?grape_type", "GET", "/api/grapes", params={"grape_type": self.rng.choice(["red", "white"])})
+
+    async def grape_detail(self):
+        await self.call("GET /grapes/{grape_id}", "GET", f"/api/grapes/{self.pick('grapes')}")
+
+    async def browse_regions(self):
+        await self.call("GET /regions", "GET", "/api/regions", params={"lang": self.rng.choice(["pt", "en"])})
+
+    async def region_detail(self):
+        await self.call("GET /regions/{region_id}", "GET", f"/api/regions/{self.pick('regions')}")
+
+    async def browse_countries(self):
+        await self.call("GET /countries", "GET", "/api/countries")
+
+    async def browse_aromas(self):
+        await self.call("GET /aromas", "GET", "/api/aromas")
+
+    async def study_tracks(self):
+        await self.call("GET /study/tracks", "GET", "/api/study/tracks", headers=self.auth)
+
+    async def track_lessons(self):
+        await self.call("GET /study/tracks/{track_id}/lessons", "GET", f"/api/study/tracks/{self.pick('tracks')}/lessons")
+
+    async def lesson_detail(self):
+        await self.call("GET /study/lessons/{lesson_id}", "GET", f"/api/study/lessons/{self.pick('lessons')}")
+
+    async def search(self):
+        await self.call("GET /search", "GET", "/api/search", params={"q": self.rng.choice(SEARCH_TERMS)})
+
+    async def suggest(self):
+        await self.call("GET /suggest", "GET", "/api/suggest", params={"q": self.rng.choice(SUGGEST_PREFIXES)})
+
+    async def create_tasting(self):
+        response = await self.call("POST /tastings", "POST", "/api/tastings", headers=self.auth, json={
+            "wine_name": f"Load test wine {self.rng.randint(1, 10000)}",
+            "producer": "Benchmark Estate",
+            "vintage": self.rng.randint(1990, 2023),
+            "grape_ids": [self.pick("grapes")],
+            "region_id": self.pick("regions"),
+            "appearance": {"clarity": "clear", "intensity": "medium", "color": "ruby"},
+            "nose": {"intensity": "medium", "aromas": ["Cherry", "Vanilla"]},
+            "palate": {"sweetness": "dry", "acidity": "medium", "tannin": "medium", "body": "medium"},
+            "conclusion": {"quality": "good"},
+            "notes": "Generated by the load test",
+        })
+        if response is not None and response.status_code == 201:
+            self.tasting_ids.append(response.json()["tasting_id"])
+
+    async def list_tastings(self):
+        await self.call("GET /tastings", "GET", "/api/tastings", headers=self.auth, params={"limit": 20})
+
+    async def tasting_detail(self):
+        if self.tasting_ids:
+            tasting_id = self.rng.choice(self.tasting_ids)
+            await self.call("GET /tastings/{tasting_id}", "GET", f"/api/tastings/{tasting_id}", headers=self.auth)
+
+    async def quiz_questions(self):
+        await self.call("GET /quiz/tracks/{track_id}/questions", "GET", f"/api/quiz/tracks/{self.pick('tracks')}/questions")
+
+    async def submit_answer(self):
+        await self.call("POST /quiz/submit", "POST", "/api/quiz/submit", headers=self.auth, json={
+            "question_id": self.pick("questions"), "selected_answer": self.rng.randint(0, 3)
+        })
+
+    async def me(self):
+        await self.call("GET /auth/me", "GET", "/api/auth/me", headers=self.auth)
+
+
+async def prepare(client: httpx.AsyncClient, users: int, seed: bool) -> tuple:
+    """Seed the catalog, collect ids to request and register the simulated students."""
+    if seed:
+        for endpoint in SEED_ENDPOINTS:
+            response = await client.post(f"/api{endpoint}", timeout=120)
+            response.raise_for_status()
+
+    tracks = [t["track_id"] for t in (await client.get("/api/study/tracks")).json()]
+    lessons, questions = [], []
+    for track_id in tracks:
+        lessons += [l["lesson_id"] for l in (await client.get(f"/api/study/tracks/{track_id}/lessons")).json()]
+        questions += [
+            q["question_id"]
+            for q in (await client.get(f"/api/quiz/tracks/{track_id}/questions", params={"limit": 100})).json()
+        ]
+    catalog = {
+        "grapes": [g["grape_id"] for g in (await client.get("/api/grapes")).json()],
+        "regions": [r["region_id"] for r in (await client.get("/api/regions")).json()],
+        "tracks": tracks,
+        "lessons": lessons,
+        "questions": questions,
+    }
+    if not all(catalog.values()):
+        raise RuntimeError(f"Catalog is empty, seed it first: { {k: len(v) for k, v in catalog.items()} }")
+
+    tokens = []
+    for _ in range(users):
+        email = f"loadtest_{uuid.uuid4().hex[:10]}@example.com"
+        credentials = {"email": email, "password": "loadtest-password"}
+        (await client.post("/api/auth/register", json={**credentials, "name": "Load Test"})).raise_for_status()
+        login = await client.post("/api/auth/login", json=credentials)
+        login.raise_for_status()
+        tokens.append(login.json()["token"])
+    return catalog, tokens
+
+
+async def drive(base_url: str, args) -> dict:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        catalog, tokens = await prepare(client, args.users, seed=not args.no_seed)
+        recorder = Recorder()
+        rng = random.Random(args.seed)
+        students = [
+            Student(client, recorder, catalog, tokens[i % len(tokens)], random.Random(rng.random()))
+            for i in range(args.concurrency)
+        ]
+
+        async def loop(student: Student, until: float):
+            while time.monotonic() < until:
+                await student.step()
+
+        # Warm-up fills caches and connection pools; only the measured phase is recorded
+        until = time.monotonic() + args.warmup
+        await asyncio.gather(*(loop(s, until) for s in students))
+        recorder.recording = True
+        started = time.monotonic()
+        await asyncio.gather(*(loop(s, started + args.duration) for s in students))
+        elapsed = time.monotonic() - started
+
+    return report(recorder, elapsed, args)
+
+
+def report(recorder: Recorder, elapsed: float, args) -> dict:
+    endpoints = {}
+    all_latencies = []
+    for name, latencies in sorted(recorder.latencies.items()):
+        latencies.sort()
+        all_latencies += latencies
+        statuses = dict(recorder.statuses[name])
+        errors = sum(count for status, count in statuses.items() if not status.startswith(("2", "3")))
+        endpoints[name] = {
+            "requests": len(latencies),
+            "throughput_rps": round(len(latencies) / elapsed, 2),
+            "errors": errors,
+            "statuses": statuses,
+            "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3),
+            "max_ms": round(latencies[-1] * 1000, 3),
+            **{f"p{p}_ms": round(percentile(latencies, p) * 1000, 3) for p in PERCENTILES},
+        }
+    all_latencies.sort()
+    return {
+        "meta": {
+            "revision": git_revision(),
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "duration_s": round(elapsed, 2),
+            "concurrency": args.concurrency,
+            "users": args.users,
+            "seed": args.seed,
+            "backend": args.base_url or storage_engine(args),
+        },
+        "total": {
+            "requests": len(all_latencies),
+            "throughput_rps": round(len(all_latencies) / elapsed, 2),
+            "errors": sum(e["errors"] for e in endpoints.values()),
+            **{f"p{p}_ms": round(percentile(all_latencies, p) * 1000, 3) for p in PERCENTILES},
+        },
+        "endpoints": endpoints,
+    }
+
+
+def print_report(result: dict) -> None:
+    header = f"{'endpoint':<42} {'req':>7} {'rps':>8} {'err':>5} {'p50':>8} {'p95':>8} {'p99':>8}"
+    print(header)
+    print("-" * len(header))
+    rows = list(result["endpoints"].items()) + [("TOTAL", result["total"])]
+    for name, stats in rows:
+        print(
+            f"{name:<42} {stats['requests']:>7} {stats['throughput_rps']:>8.1f} {stats['errors']:>5} "
+            f"{stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f} {stats['p99_ms']:>8.2f}"
+        )
+
+
+# ======================== COMPARE ========================
+
+def compare(before: dict, after: dict, threshold: float) -> bool:
+    """Print per-endpoint deltas; True if any p95/p99 or throughput regressed beyond ``threshold`` %."""
+    regressed = False
+    print(f"{'endpoint':<42} {'metric':<15} {'before':>10} {'after':>10} {'change':>9}")
+    names = sorted(set(before["endpoints"]) & set(after["endpoints"])) + ["TOTAL"]
+    for name in names:
+        old = before["total"] if name == "TOTAL" else before["endpoints"][name]
+        new = after["total"] if name == "TOTAL" else after["endpoints"][name]
+        for metric, higher_is_better in (("throughput_rps", True), ("p50_ms", False), ("p95_ms", False), ("p99_ms", False)):
+            if not old.get(metric):
+                continue
+            change = (new[metric] - old[metric]) / old[metric] * 100
+            worse = -change if higher_is_better else change
+            flag = ""
+            if worse > threshold and metric != "p50_ms":
+                regressed = True
+                flag = "  REGRESSION"
+            print(f"{name:<42} {metric:<15} {old[metric]:>10.2f} {new[metric]:>10.2f} {change:>+8.1f}%{flag}")
+    for name in sorted(set(before["endpoints"]) ^ set(after["endpoints"])):
+        print(f"{name:<42} only in {'before' if name in before['endpoints'] else 'after'}")
+    return regressed
+
+
+# ======================== CLI ========================
+
+def main():
+    parser = argparse.ArgumentParser(description="WineStudy API load test")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run the mixed workload and report per-endpoint latency")
+    target = run.add_mutually_exclusive_group(required=True)
+    target.add_argument("--mongo-url", help="Start the API against a throwaway database on this MongoDB")
+    target.add_argument("--postgres-url", help="Start the API on the PostgreSQL storage engine (tables are kept)")
+    target.add_argument("--in-memory", action="store_true", help="Start the API on the in-memory storage engine")
+    target.add_argument("--base-url", help="Benchmark an already running API instead")
+    run.add_argument("--duration", type=float, default=30.0, help="Measured seconds")
+    run.add_argument("--warmup", type=float, default=5.0, help="Unrecorded warm-up seconds")
+    run.add_argument("--concurrency", type=int, default=16, help="Concurrent simulated students")
+    run.add_argument("--users", type=int, default=8, help="Registered accounts shared by the students")
+    run.add_argument("--workers", type=int, default=1, help="uvicorn workers (not with --in-memory)")
+    run.add_argument("--seed", type=int, default=42, help="Random seed of the workload")
+    run.add_argument("--no-seed", action="store_true", help="Do not call the /seed* endpoints first")
+    run.add_argument("--output", help="Write the JSON report here")
+
+    diff = commands.add_parser("compare", help="Compare two JSON reports")
+    diff.add_argument("before")
+    diff.add_argument("after")
+    diff.add_argument("--threshold", type=float, default=10.0, help="Regression threshold in percent")
+
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        before, after = (json.loads(Path(path).read_text()) for path in (args.before, args.after))
+        sys.exit(1 if compare(before, after, args.threshold) else 0)
+
+    server = None
+    base_url = args.base_url
+    if not base_url:
+        server = LocalServer(storage_engine(args), args.workers, mongo_url=args.mongo_url, postgres_url=args.postgres_url)
+        server.start()
+        base_url = server.base_url
+
+    async def run_all():
+        if server:
+            await server.wait_ready()
+        return await drive(base_url, args)
+
+    try:
+        result = asyncio.run(run_all())
+    finally:
+        if server:
+            server.stop()
+
+    print_report(result)
+    if args.output:
+        Path(args.output).write_text(json.dumps(result, indent=2))
+        print(f"\nReport written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
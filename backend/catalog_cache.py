@@ -0,0 +1,166 @@
+# In-process read-through cache for the WineStudy reference catalog
+# The catalog (countries, regions, grapes, aromas, study content) only changes when a
+# /seed* endpoint runs, so it is loaded once per worker and served from memory.
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# collection name -> primary key field
+CATALOG_COLLECTIONS = {
+    "countries": "country_id",
+    "regions": "region_id",
+    "grapes": "grape_id",
+    "aroma_tags": "tag_id",
+    "study_tracks": "track_id",
+    "lessons": "lesson_id",
+    "quiz_questions": "question_id",
+}
+
+CATALOG_META_ID = "catalog"
+
+
+def _field_matches(value: Any, expected: Any) -> bool:
+    # Same semantics as a Mongo equality filter: arrays match if they contain the value
+    if isinstance(value, list):
+        return expected in value
+    return value == expected
+
+
+class GrapeIndex:
+    """Inverted indexes (type, aroma, region -> grapes) answering combined filters by set intersection.
+
+    Index entries are positions in the grape list, so results keep catalog order and cost
+    O(result) instead of a scan over every grape.
+    """
+
+    def __init__(self, grapes: List[dict]):
+        self._grapes = grapes
+        self.by_type: Dict[str, set] = defaultdict(set)
+        self.by_aroma: Dict[str, set] = defaultdict(set)
+        self.by_region: Dict[str, set] = defaultdict(set)
+        for position, grape in enumerate(grapes):
+            self.by_type[grape.get("grape_type")].add(position)
+            for aroma in grape.get("aromatic_notes", []) + grape.get("flavor_notes", []):
+                self.by_aroma[aroma].add(position)
+            for region in grape.get("best_regions", []):
+                self.by_region[region].add(position)
+
+    def query(
+        self,
+        grape_type: Optional[str] = None,
+        aroma: Optional[str] = None,
+        region: Optional[str] = None
+    ) -> List[dict]:
+        postings = []
+        if grape_type:
+            postings.append(self.by_type.get(grape_type, set()))
+        if aroma:
+            postings.append(self.by_aroma.get(aroma, set()))
+        if region:
+            postings.append(self.by_region.get(region, set()))
+        if not postings:
+            return list(self._grapes)
+
+        # Intersect starting from the most selective posting list
+        postings.sort(key=len)
+        positions = postings[0].intersection(*postings[1:])
+        return [self._grapes[position] for position in sorted(positions)]
+
+
+class CatalogSnapshot:
+    """Immutable, versioned view of every catalog collection."""
+
+    def __init__(self, version: str, collections: Dict[str, List[dict]]):
+        self.version = version
+        self._items = collections
+        self._by_id = {
+            name: {doc[key]: doc for doc in collections.get(name, []) if key in doc}
+            for name, key in CATALOG_COLLECTIONS.items()
+        }
+        self.grape_index = GrapeIndex(collections.get("grapes", []))
+        self._derived: Dict[str, Any] = {}
+
+    def all(self, collection: str) -> List[dict]:
+        return self._items.get(collection, [])
+
+    def get(self, collection: str, doc_id: str) -> Optional[dict]:
+        return self._by_id.get(collection, {}).get(doc_id)
+
+    def derived(self, name: str, build: Callable[["CatalogSnapshot"], Any]) -> Any:
+        """Structure computed from this snapshot on first use (search index, ...), dropped with it."""
+        if name not in self._derived:
+            self._derived[name] = build(self)
+        return self._derived[name]
+
+    def find(self, collection: str, **filters: Any) -> List[dict]:
+        """Equality filters with Mongo array semantics; ``None`` filters are ignored."""
+        active = [(field, value) for field, value in filters.items() if value is not None]
+        if not active:
+            return self.all(collection)
+        return [
+            doc for doc in self.all(collection)
+            if all(_field_matches(doc.get(field), value) for field, value in active)
+        ]
+
+
+class CatalogCache:
+    """Loads the catalog once and reloads it only when the catalog version changes.
+
+    The version is stored next to the catalog so that every worker notices a reseed; it
+    is re-checked at most once per ``check_interval`` seconds, so bursts of catalog reads
+    never reach the database. ``store`` is a storage.CatalogRepository.
+    """
+
+    def __init__(self, store, check_interval: float = 30.0):
+        self._store = store
+        self._check_interval = check_interval
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+
+    @property
+    def version(self) -> Optional[str]:
+        return self._snapshot.version if self._snapshot else None
+
+    async def snapshot(self) -> CatalogSnapshot:
+        snapshot = self._snapshot
+        if snapshot and time.monotonic() - self._checked_at < self._check_interval:
+            return snapshot
+
+        async with self._lock:
+            # Another request may have refreshed while we waited for the lock
+            if self._snapshot and time.monotonic() - self._checked_at < self._check_interval:
+                return self._snapshot
+
+            started = time.perf_counter()
+            version, collections = await self._store.load_if_changed(self.version)
+            if collections is not None:
+                self._snapshot = self._build(version, collections, started)
+            self._checked_at = time.monotonic()
+            return self._snapshot
+
+    async def invalidate(self) -> str:
+        """Bump the catalog version after a seed write; every worker reloads on next read."""
+        version = uuid.uuid4().hex
+        # Under the lock: a load that started before the seed wrote must not store its
+        # pre-seed snapshot after this and keep serving it for check_interval seconds
+        async with self._lock:
+            await self._store.set_version(version)
+            self._snapshot = None
+            self._checked_at = 0.0
+        logger.info(f"Catalog invalidated, new version {version}")
+        return version
+
+    def _build(self, version: str, collections: Dict[str, List[dict]], started: float) -> CatalogSnapshot:
+        collections["lessons"].sort(key=lambda lesson: lesson.get("order", 0))
+        logger.info(
+            f"Catalog version {version} loaded in {(time.perf_counter() - started) * 1000:.1f}ms "
+            f"({', '.join(f'{name}={len(docs)}' for name, docs in collections.items())})"
+        )
+        return CatalogSnapshot(version, collections)
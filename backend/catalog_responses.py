@@ -0,0 +1,113 @@
+# Ready-encoded JSON bodies for the catalog endpoints
+# A catalog payload only changes with the snapshot, so each (endpoint, filters, language)
+# combination is validated through its Pydantic model and encoded once per snapshot, along
+# with its compressed variants; requests then just pick the bytes for their Accept-Encoding.
+# Every variant carries a strong ETag, so revalidations are answered with an empty 304.
+
+import gzip
+import hashlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from pydantic import TypeAdapter
+from starlette.responses import Response
+
+from compression import choose_coding
+
+try:
+    import brotli
+except ImportError:  # optional: responses are then offered as gzip only
+    brotli = None
+
+# Bodies smaller than this are not worth compressing
+MIN_COMPRESS_SIZE = 512
+GZIP_LEVEL = 9
+# Variants are built inline by the first request for a key: quality 11 takes >100 ms on the
+# grape and region lists and stalls the worker, quality 5 takes ~2 ms for ~13% more bytes
+BROTLI_QUALITY = 5
+# Arbitrary filter values must not grow a snapshot's cache without bound
+MAX_ENTRIES = 512
+
+_adapters: Dict[Any, TypeAdapter] = {}
+
+
+def _adapter(model: Any) -> TypeAdapter:
+    adapter = _adapters.get(model)
+    if adapter is None:
+        adapter = _adapters[model] = TypeAdapter(model)
+    return adapter
+
+
+def _etag_matches(if_none_match: str, etags) -> bool:
+    """If-None-Match uses the weak comparison: W/"x" matches "x"."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return any(etag in candidates for etag in etags)
+
+
+class EncodedPayload:
+    """One JSON body plus its gzip (and brotli, if available) variants and their ETags."""
+
+    __slots__ = ("body", "variants", "digest")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        # Content digest: a reseed that leaves this payload unchanged keeps client caches valid
+        self.digest = hashlib.sha256(body).hexdigest()[:32]
+        self.variants: Dict[str, bytes] = {}
+        if len(body) >= MIN_COMPRESS_SIZE:
+            if brotli is not None:
+                self.variants["br"] = brotli.compress(body, quality=BROTLI_QUALITY)
+            # mtime=0 keeps the bytes (and anything derived from them) stable across rebuilds
+            self.variants["gzip"] = gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+    def etag(self, coding: Optional[str] = None) -> str:
+        # Strong ETags must differ between encodings of the same content
+        return f'"{self.digest}-{coding}"' if coding else f'"{self.digest}"'
+
+    def response(
+        self,
+        accept_encoding: str = "",
+        if_none_match: str = "",
+        headers: Optional[Dict[str, str]] = None
+    ) -> Response:
+        headers = {"Vary": "Accept-Encoding", **(headers or {})}
+        coding = choose_coding(accept_encoding, tuple(self.variants)) if self.variants else None
+        headers["ETag"] = self.etag(coding)
+        # Any variant's tag proves the client holds this content
+        if _etag_matches(if_none_match, [self.etag(None), *map(self.etag, self.variants)]):
+            return Response(status_code=304, headers=headers)
+        if coding:
+            headers["Content-Encoding"] = coding
+            return Response(self.variants[coding], media_type="application/json", headers=headers)
+        return Response(self.body, media_type="application/json", headers=headers)
+
+
+class CatalogResponses:
+    """Per-snapshot cache of EncodedPayloads, keyed by endpoint, filters and language."""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Optional[EncodedPayload]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, model: Any, build: Callable[[], Any]) -> Optional[EncodedPayload]:
+        """Encoded ``build()`` validated as ``model``; ``None`` if ``build()`` returned ``None``."""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+        data = build()
+        payload = None
+        if data is not None:
+            adapter = _adapter(model)
+            payload = EncodedPayload(adapter.dump_json(adapter.validate_python(data), exclude_none=True))
+        self._entries[key] = payload
+        if len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        return payload
@@ -0,0 +1,98 @@
+# Compiled snapshot of the seed data modules (grape_data, region_data, seed_content)
+# The modules are several hundred KB of literals that only the /seed* endpoints need, so
+# nothing imports them at startup: load_seed_data() reads a pickled snapshot instead and
+# only falls back to importing (and recompiling the snapshot) when the sources changed.
+#
+# Prebuild at deploy time with:  python catalog_snapshot.py
+
+import hashlib
+import importlib
+import logging
+import os
+import pickle
+import sys
+from pathlib import Path
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = Path(__file__).parent
+SEED_MODULES = ("grape_data", "region_data", "seed_content")
+# Bump whenever the layout of the snapshot payload changes
+FORMAT_VERSION = 1
+SNAPSHOT_PATH = Path(os.environ.get("CATALOG_SNAPSHOT_PATH", BACKEND_DIR / "catalog_snapshot.pkl"))
+
+
+def source_hash() -> str:
+    """Digest of the seed module sources; a snapshot built from other sources is stale."""
+    digest = hashlib.sha256(f"format:{FORMAT_VERSION}".encode())
+    for name in SEED_MODULES:
+        digest.update(name.encode())
+        digest.update((BACKEND_DIR / f"{name}.py").read_bytes())
+    return digest.hexdigest()
+
+
+def _import_seed_data() -> Dict[str, Any]:
+    """Every upper-case constant of the seed modules, keyed by its lower-cased name."""
+    data = {}
+    for name in SEED_MODULES:
+        already_loaded = name in sys.modules
+        module = importlib.import_module(name)
+        data.update({key.lower(): value for key, value in vars(module).items() if key.isupper()})
+        if not already_loaded:
+            # Keep the module objects (and their literals) out of the long-running process
+            del sys.modules[name]
+    return data
+
+
+def _read_snapshot(path: Path, expected_source: str):
+    try:
+        with open(path, "rb") as f:
+            header, payload = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as exc:
+        logger.warning(f"Unreadable catalog snapshot {path}: {exc}")
+        return None
+    if header.get("format") != FORMAT_VERSION or header.get("source") != expected_source:
+        return None
+    if hashlib.sha256(payload).hexdigest() != header.get("payload"):
+        logger.warning(f"Catalog snapshot {path} is corrupt, rebuilding")
+        return None
+    return pickle.loads(payload)
+
+
+def build_snapshot(path: Path = SNAPSHOT_PATH) -> Dict[str, Any]:
+    """Import the seed modules and (re)write the snapshot atomically; returns the data."""
+    expected_source = source_hash()
+    data = _import_seed_data()
+    payload = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+    header = {"format": FORMAT_VERSION, "source": expected_source, "payload": hashlib.sha256(payload).hexdigest()}
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            pickle.dump((header, payload), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except OSError as exc:
+        # A read-only deployment still seeds, it just pays the import every time
+        logger.warning(f"Could not write catalog snapshot {path}: {exc}")
+        tmp_path.unlink(missing_ok=True)
+    return data
+
+
+def load_seed_data(path: Path = SNAPSHOT_PATH) -> Dict[str, Any]:
+    """Seed data from the snapshot, rebuilding it first if it is missing or stale.
+
+    Nothing is cached in the process: callers keep the data only while they seed.
+    """
+    data = _read_snapshot(path, source_hash())
+    if data is None:
+        logger.info(f"Building catalog snapshot {path}")
+        data = build_snapshot(path)
+    return data
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    built = build_snapshot()
+    print(f"Wrote {SNAPSHOT_PATH} ({len(built)} data sets)")
@@ -0,0 +1,183 @@
+# Negotiated response compression (zstd / brotli / gzip) as a pure ASGI middleware
+# Small bodies go out as-is, large or streamed bodies are compressed chunk by chunk, and
+# responses that already carry a Content-Encoding (the catalog's pre-compressed bytes)
+# pass through untouched.
+
+import zlib
+from typing import Dict, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # optional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional
+    zstandard = None
+
+# Server preference when the client accepts several codings equally
+PREFERRED_CODINGS = ("zstd", "br", "gzip")
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "application/xml", "image/svg+xml")
+
+
+def parse_accept_encoding(accept_encoding: str) -> Dict[str, float]:
+    """{"gzip": 1.0, "br": 0.5, ...}; codings with q=0 are left out."""
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip().replace(" ", "")
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if q > 0:
+            accepted[name] = q
+    return accepted
+
+
+def available_codings():
+    return tuple(
+        coding for coding in PREFERRED_CODINGS
+        if (coding == "br" and brotli is not None)
+        or (coding == "zstd" and zstandard is not None)
+        or coding == "gzip"
+    )
+
+
+def choose_coding(accept_encoding: str, codings=None) -> Optional[str]:
+    """Highest-q coding the client accepts, ties broken by server preference."""
+    accepted = parse_accept_encoding(accept_encoding)
+    candidates = [
+        (accepted.get(coding, accepted.get("*", 0.0)), -rank, coding)
+        for rank, coding in enumerate(codings or available_codings())
+    ]
+    q, _, coding = max(candidates, default=(0.0, 0, None))
+    return coding if q > 0 else None
+
+
+class _Compressor:
+    """Uniform streaming interface over the three codecs."""
+
+    def __init__(self, coding: str, gzip_level: int, brotli_quality: int, zstd_level: int):
+        if coding == "gzip":
+            self._codec = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+            self._compress = self._codec.compress
+            self._flush = lambda: self._codec.flush(zlib.Z_SYNC_FLUSH)
+            self._finish = self._codec.flush
+        elif coding == "br":
+            self._codec = brotli.Compressor(quality=brotli_quality)
+            self._compress = self._codec.process
+            self._flush = self._codec.flush
+            self._finish = self._codec.finish
+        else:
+            self._codec = zstandard.ZstdCompressor(level=zstd_level).compressobj()
+            self._compress = self._codec.compress
+            self._flush = lambda: self._codec.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+            self._finish = self._codec.flush
+
+    def chunk(self, data: bytes) -> bytes:
+        # Flushed per chunk so a streamed response reaches the client as it is produced
+        return self._compress(data) + self._flush()
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compress(data) + self._finish()
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        zstd_level: int = 3
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = (gzip_level, brotli_quality, zstd_level)
+        self.codings = available_codings()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        coding = choose_coding(Headers(scope=scope).get("accept-encoding", ""), self.codings)
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+        await _CompressedResponder(self, coding, send).run(scope, receive)
+
+
+class _CompressedResponder:
+    def __init__(self, middleware: CompressionMiddleware, coding: str, send):
+        self.middleware = middleware
+        self.coding = coding
+        self.send = send
+        self.start_message = None
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+
+    async def run(self, scope, receive):
+        await self.middleware.app(scope, receive, self.send_wrapper)
+
+    def _compressible(self, headers: Headers) -> bool:
+        if self.start_message["status"] < 200 or self.start_message["status"] in (204, 304):
+            return False
+        if "content-encoding" in headers or "no-transform" in headers.get("cache-control", ""):
+            return False
+        content_type = headers.get("content-type", "")
+        return content_type.startswith(COMPRESSIBLE_TYPES) and "text/event-stream" not in content_type
+
+    def _start_compressing(self) -> MutableHeaders:
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        headers["Content-Encoding"] = self.coding
+        vary = [v.strip() for v in headers.get("vary", "").split(",") if v.strip()]
+        if "accept-encoding" not in (v.lower() for v in vary):
+            headers["Vary"] = ", ".join([*vary, "Accept-Encoding"])
+        if "content-length" in headers:
+            del headers["content-length"]
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            # The compressed bytes differ from the ones the strong tag was computed for
+            headers["ETag"] = f"W/{etag}"
+        self.compressor = _Compressor(self.coding, *self.middleware.levels)
+        return headers
+
+    async def send_wrapper(self, message):
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is None:
+            headers = Headers(raw=self.start_message["headers"])
+            small = not more_body and len(body) < self.middleware.minimum_size
+            if small or not self._compressible(headers):
+                self.passthrough = True
+                await self.send(self.start_message)
+                await self.send(message)
+                return
+            headers = self._start_compressing()
+            if not more_body:
+                body = self.compressor.finish(body)
+                headers["Content-Length"] = str(len(body))
+                await self.send(self.start_message)
+                await self.send({"type": "http.response.body", "body": body})
+                return
+            await self.send(self.start_message)
+
+        body = self.compressor.chunk(body) if more_body else self.compressor.finish(body)
+        await self.send({"type": "http.response.body", "body": body, "more_body": more_body})
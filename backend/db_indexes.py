@@ -0,0 +1,82 @@
+# Declared MongoDB indexes for WineStudy
+# ensure_indexes() is run on startup; create_index is idempotent, so existing indexes are left alone.
+
+import logging
+import time
+from typing import Any, Dict, List, Tuple
+
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import PyMongoError
+
+logger = logging.getLogger(__name__)
+
+# (collection, keys, options)
+INDEX_SPECS: List[Tuple[str, List[Tuple[str, int]], Dict[str, Any]]] = [
+    # Identity
+    ("users", [("email", ASCENDING)], {"name": "email_unique", "unique": True}),
+    ("users", [("user_id", ASCENDING)], {"name": "user_id_unique", "unique": True}),
+    ("user_sessions", [("session_token", ASCENDING)], {"name": "session_token_unique", "unique": True}),
+    ("user_sessions", [("user_id", ASCENDING)], {"name": "user_id"}),
+    # Sessions are removed by MongoDB once expires_at (a BSON date) has passed
+    ("user_sessions", [("expires_at", ASCENDING)], {"name": "expires_at_ttl", "expireAfterSeconds": 0}),
+    # User data
+    ("tastings", [("tasting_id", ASCENDING)], {"name": "tasting_id_unique", "unique": True}),
+    # Serves the newest-first keyset pagination of GET /tastings
+    (
+        "tastings",
+        [("user_id", ASCENDING), ("created_at", DESCENDING), ("tasting_id", DESCENDING)],
+        {"name": "user_id_created_at_tasting_id"}
+    ),
+    ("user_progress", [("user_id", ASCENDING)], {"name": "user_id_unique", "unique": True}),
+    ("quiz_reviews", [("user_id", ASCENDING), ("question_id", ASCENDING)], {"name": "user_id_question_id_unique", "unique": True}),
+    # Serves GET /quiz/review: the due cards of a user, most overdue first
+    ("quiz_reviews", [("user_id", ASCENDING), ("due_at", ASCENDING)], {"name": "user_id_due_at"}),
+    # Catalog
+    ("countries", [("country_id", ASCENDING)], {"name": "country_id_unique", "unique": True}),
+    ("regions", [("region_id", ASCENDING)], {"name": "region_id_unique", "unique": True}),
+    ("grapes", [("grape_id", ASCENDING)], {"name": "grape_id_unique", "unique": True}),
+    ("aroma_tags", [("tag_id", ASCENDING)], {"name": "tag_id_unique", "unique": True}),
+    ("study_tracks", [("track_id", ASCENDING)], {"name": "track_id_unique", "unique": True}),
+    ("lessons", [("lesson_id", ASCENDING)], {"name": "lesson_id_unique", "unique": True}),
+    ("lessons", [("track_id", ASCENDING), ("order", ASCENDING)], {"name": "track_id_order"}),
+    ("quiz_questions", [("question_id", ASCENDING)], {"name": "question_id_unique", "unique": True}),
+    ("quiz_questions", [("track_id", ASCENDING)], {"name": "track_id"}),
+    # Seeding pipeline content hashes
+    ("seed_manifest", [("collection", ASCENDING), ("source", ASCENDING)], {"name": "collection_source"}),
+]
+
+# Last ensure_indexes() result, exposed by GET /api/health/indexes
+index_status: Dict[str, Any] = {"state": "pending", "indexes": []}
+
+
+async def ensure_indexes(db) -> Dict[str, Any]:
+    """Create every declared index, recording per-index success or failure.
+
+    A failing index (e.g. duplicate data under a unique key, or an existing index
+    with different options) is logged and reported but does not stop the others.
+    """
+    started = time.perf_counter()
+    results = []
+    index_status.update({"state": "building", "indexes": results})
+
+    for collection, keys, options in INDEX_SPECS:
+        entry = {"collection": collection, "name": options["name"], "keys": keys}
+        try:
+            await db[collection].create_index(keys, **options)
+            entry["status"] = "ok"
+        except PyMongoError as e:
+            entry["status"] = "failed"
+            entry["error"] = str(e)
+            logger.error(f"Index {collection}.{options['name']} failed: {e}")
+        results.append(entry)
+
+    failed = [r for r in results if r["status"] == "failed"]
+    index_status.update({
+        "state": "failed" if failed else "ready",
+        "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+        "indexes": results,
+    })
+    logger.info(
+        f"Ensured {len(results) - len(failed)}/{len(results)} indexes in {index_status['duration_ms']}ms"
+    )
+    return index_status
@@ -0,0 +1,38 @@
+# Language scoping for bilingual catalog documents
+# Every translatable field is stored as <field>_pt / <field>_en; a scoped payload keeps only one of them.
+
+from typing import List, Optional
+
+SUPPORTED_LANGUAGES = ("pt", "en")
+
+
+def localize(doc: dict, lang: Optional[str]) -> dict:
+    """Drop the other languages' ``_xx`` fields, recursing into nested dicts (terroir, climate...).
+
+    Field names are kept as-is (``description_en`` stays ``description_en``), so clients
+    that pick ``field_<lang>`` keep working. ``lang=None`` returns the document unchanged.
+    """
+    if lang is None:
+        return doc
+    other_suffixes = tuple(f"_{other}" for other in SUPPORTED_LANGUAGES if other != lang)
+    scoped = {}
+    for key, value in doc.items():
+        if key.endswith(other_suffixes):
+            continue
+        if isinstance(value, dict):
+            value = localize(value, lang)
+        scoped[key] = value
+    return scoped
+
+
+def localize_many(docs: List[dict], lang: Optional[str]) -> List[dict]:
+    if lang is None:
+        return docs
+    return [localize(doc, lang) for doc in docs]
+
+
+def localize_one(doc: Optional[dict], lang: Optional[str]) -> Optional[dict]:
+    """localize() for a lookup that may have found nothing."""
+    if doc is None:
+        return None
+    return localize(doc, lang)
@@ -0,0 +1,30 @@
+# App-wide JSON response class backed by orjson
+# orjson encodes datetime, UUID and nested dicts (structure, terroir, climate...) natively
+# and is several times faster than the stdlib encoder behind JSONResponse.
+# Compare with: python benchmarks/json_encoding.py
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+def _default(value: Any) -> Any:
+    # Only reached for types orjson does not know; handlers returning Response directly may pass these
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(JSONResponse):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,259 @@
+# Per-route request metrics rendered in the Prometheus text exposition format
+# Requests are labelled by route template (/api/tastings/{tasting_id}), never by raw path,
+# so label cardinality stays bounded by the number of routes.
+
+import time
+from collections import OrderedDict, defaultdict
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from starlette.routing import Match
+
+# Latency histogram upper bounds, in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+UNMATCHED_ROUTE = "unmatched"
+# (method, path) -> route template; raw paths carry ids, so the memo is bounded
+MAX_RESOLVED_PATHS = 4096
+
+# Route template of the request being served, for metrics recorded further down (MongoDB commands)
+current_route: ContextVar[str] = ContextVar("current_route", default="-")
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = ()):
+        self.name, self.help, self.label_names = name, help_text, labels
+        self.values: Dict[Tuple[str, ...], float] = defaultdict(float)
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self.values[labels] += amount
+
+    def samples(self) -> Iterable[str]:
+        for labels, value in sorted(self.values.items()):
+            yield f"{self.name}{_labels(self.label_names, labels)} {_number(value)}"
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.values[labels] -= amount
+
+    def set(self, *labels: str, value: float) -> None:
+        self.values[labels] = value
+
+
+class CollectedCounter(Counter):
+    """Counter whose running totals are kept elsewhere and copied in by a collector."""
+
+    def set(self, *labels: str, value: float) -> None:
+        self.values[labels] = value
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = (), buckets=DEFAULT_BUCKETS):
+        self.name, self.help, self.label_names = name, help_text, labels
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts..., +Inf count], sum
+        self.counts: Dict[Tuple[str, ...], List[int]] = {}
+        self.sums: Dict[Tuple[str, ...], float] = defaultdict(float)
+
+    def observe(self, *labels: str, value: float) -> None:
+        counts = self.counts.get(labels)
+        if counts is None:
+            counts = self.counts[labels] = [0] * (len(self.buckets) + 1)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[i] += 1
+                break
+        else:
+            counts[-1] += 1
+        self.sums[labels] += value
+
+    def samples(self) -> Iterable[str]:
+        for labels, counts in sorted(self.counts.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                yield f"{self.name}_bucket{_labels(self.label_names, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.label_names, labels)} {_number(self.sums[labels])}"
+            yield f"{self.name}_count{_labels(self.label_names, labels)} {cumulative}"
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = []
+        # Called before rendering, to refresh gauges that mirror state kept elsewhere
+        self._collectors: List[Callable[[], None]] = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        for collector in self._collectors:
+            collector()
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+REQUESTS = registry.register(Counter(
+    "http_requests_total", "HTTP requests by route template and status", ("method", "route", "status")
+))
+LATENCY = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ("method", "route")
+))
+IN_FLIGHT = registry.register(Gauge(
+    "http_requests_in_progress", "HTTP requests currently being served", ("method", "route")
+))
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware; the route template is resolved before the request runs so the
+    in-flight gauge can be labelled with it.
+    """
+
+    def __init__(self, app, router=None):
+        self.app = app
+        self.router = router
+        self._templates: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+
+    def _route_template(self, scope) -> str:
+        key = (scope["method"], scope["path"])
+        template = self._templates.get(key)
+        if template is not None:
+            self._templates.move_to_end(key)
+            return template
+
+        template = UNMATCHED_ROUTE
+        partial: Optional[str] = None
+        for route in getattr(self.router, "routes", ()):
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                template = route.path
+                break
+            if match == Match.PARTIAL and partial is None:
+                # Right path, wrong method (405): still worth attributing to the route
+                partial = route.path
+        else:
+            template = partial or UNMATCHED_ROUTE
+
+        self._templates[key] = template
+        if len(self._templates) > MAX_RESOLVED_PATHS:
+            self._templates.popitem(last=False)
+        return template
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = self._route_template(scope)
+        status = ["500"]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = str(message["status"])
+            await send(message)
+
+        IN_FLIGHT.inc(method, route)
+        token = current_route.set(route)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            LATENCY.observe(method, route, value=time.perf_counter() - started)
+            REQUESTS.inc(method, route, status[0])
+            IN_FLIGHT.dec(method, route)
+            current_route.reset(token)
+
+
+def register_pool_metrics(pool_metrics) -> None:
+    """Expose a mongo_pool.PoolMetrics listener's per-server state; running totals as counters."""
+    fields = {
+        "open": registry.register(Gauge(
+            "mongo_pool_connections_open", "Open connections in the MongoDB pool", ("address",)
+        )),
+        "checked_out": registry.register(Gauge(
+            "mongo_pool_connections_checked_out", "Connections currently checked out", ("address",)
+        )),
+        "checkouts": registry.register(CollectedCounter(
+            "mongo_pool_checkouts_total", "Successful connection check-outs", ("address",)
+        )),
+        "checkout_failures": registry.register(CollectedCounter(
+            "mongo_pool_checkout_failures_total", "Failed connection check-outs", ("address",)
+        )),
+        "wait_seconds_total": registry.register(CollectedCounter(
+            "mongo_pool_checkout_wait_seconds_total", "Time spent waiting for a connection", ("address",)
+        )),
+        "wait_seconds_max": registry.register(Gauge(
+            "mongo_pool_checkout_wait_seconds_max", "Longest wait for a connection", ("address",)
+        )),
+    }
+
+    def collect():
+        for metric in fields.values():
+            metric.values.clear()
+        for address, stats in pool_metrics.snapshot()["pools"].items():
+            for field, metric in fields.items():
+                metric.set(address, value=stats[field])
+
+    registry.add_collector(collect)
+
+
+def register_query_metrics(query_stats) -> None:
+    """Expose a query_stats.QueryStats listener's per (route, shape) totals."""
+    labels = ("route", "shape")
+    fields = {
+        "count": registry.register(CollectedCounter(
+            "mongo_commands_total", "MongoDB commands by route and query shape", labels
+        )),
+        "failures": registry.register(CollectedCounter("mongo_command_failures_total", "Failed MongoDB commands", labels)),
+        "total_seconds": registry.register(CollectedCounter(
+            "mongo_command_seconds_total", "Time spent in MongoDB commands", labels
+        )),
+        "docs_returned": registry.register(CollectedCounter(
+            "mongo_command_documents_returned_total", "Documents returned by MongoDB commands", labels
+        )),
+    }
+
+    def collect():
+        for metric in fields.values():
+            metric.values.clear()
+        for row in query_stats.snapshot(limit=None):
+            for field, metric in fields.items():
+                metric.set(row["route"], row["shape"], value=row[field])
+
+    registry.add_collector(collect)
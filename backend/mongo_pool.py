@@ -0,0 +1,149 @@
+# MongoDB client configuration and connection pool metrics
+# Pool sizing, timeouts, wire compression and read preferences come from the environment;
+# a ConnectionPoolListener tracks pool utilisation and check-out wait times per server.
+
+import importlib.util
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Mapping, Optional
+
+from pymongo import ReadPreference, monitoring
+
+# Wire compressors in order of preference; those whose codec is not installed are dropped
+COMPRESSOR_MODULES = {"zstd": "zstandard", "snappy": "snappy", "zlib": None}
+
+READ_PREFERENCES = {
+    "primary": ReadPreference.PRIMARY,
+    "primaryPreferred": ReadPreference.PRIMARY_PREFERRED,
+    "secondary": ReadPreference.SECONDARY,
+    "secondaryPreferred": ReadPreference.SECONDARY_PREFERRED,
+    "nearest": ReadPreference.NEAREST,
+}
+
+# option -> (environment variable, default)
+_INT_OPTIONS = {
+    "maxPoolSize": ("MONGO_MAX_POOL_SIZE", 100),
+    "minPoolSize": ("MONGO_MIN_POOL_SIZE", 0),
+    "maxIdleTimeMS": ("MONGO_MAX_IDLE_TIME_MS", 300000),
+    "waitQueueTimeoutMS": ("MONGO_WAIT_QUEUE_TIMEOUT_MS", 10000),
+    "serverSelectionTimeoutMS": ("MONGO_SERVER_SELECTION_TIMEOUT_MS", 5000),
+    "connectTimeoutMS": ("MONGO_CONNECT_TIMEOUT_MS", 5000),
+    "socketTimeoutMS": ("MONGO_SOCKET_TIMEOUT_MS", 30000),
+}
+
+
+def available_compressors(requested: str) -> list:
+    compressors = []
+    for name in (c.strip() for c in requested.split(",")):
+        if name not in COMPRESSOR_MODULES:
+            continue
+        module = COMPRESSOR_MODULES[name]
+        if module is None or importlib.util.find_spec(module) is not None:
+            compressors.append(name)
+    return compressors
+
+
+def client_options(environ: Mapping[str, str]) -> dict:
+    """Keyword arguments for AsyncIOMotorClient from MONGO_* environment variables."""
+    options = {name: int(environ.get(var, default)) for name, (var, default) in _INT_OPTIONS.items()}
+    compressors = available_compressors(environ.get("MONGO_COMPRESSORS", "zstd,snappy,zlib"))
+    if compressors:
+        options["compressors"] = compressors
+    return options
+
+
+def read_preference(name: str):
+    try:
+        return READ_PREFERENCES[name]
+    except KeyError:
+        raise ValueError(f"Unknown read preference: {name}") from None
+
+
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    """Connections open / checked out per server, and how long check-outs waited.
+
+    Check-outs run on Motor's worker threads, so the start of a wait is kept per thread.
+    """
+
+    def __init__(self, max_pool_size: Optional[int] = None):
+        self.max_pool_size = max_pool_size
+        self._lock = threading.Lock()
+        self._waits = threading.local()
+        self._pools: Dict[str, Dict[str, float]] = defaultdict(lambda: {
+            "open": 0,
+            "checked_out": 0,
+            "checkouts": 0,
+            "checkout_failures": 0,
+            "wait_seconds_total": 0.0,
+            "wait_seconds_max": 0.0,
+            "cleared": 0,
+        })
+
+    @staticmethod
+    def _key(address) -> str:
+        return f"{address[0]}:{address[1]}"
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            pools = {}
+            for address, stats in self._pools.items():
+                pools[address] = dict(stats)
+                if self.max_pool_size:
+                    pools[address]["utilization"] = round(stats["checked_out"] / self.max_pool_size, 3)
+            return {"max_pool_size": self.max_pool_size, "pools": pools}
+
+    def _finish_wait(self, event, failed: bool) -> None:
+        started = getattr(self._waits, "started", None)
+        self._waits.started = None
+        waited = time.perf_counter() - started if started is not None else 0.0
+        with self._lock:
+            stats = self._pools[self._key(event.address)]
+            if failed:
+                stats["checkout_failures"] += 1
+            else:
+                stats["checkouts"] += 1
+                stats["checked_out"] += 1
+            stats["wait_seconds_total"] += waited
+            stats["wait_seconds_max"] = max(stats["wait_seconds_max"], waited)
+
+    def pool_created(self, event):
+        with self._lock:
+            self._pools[self._key(event.address)]
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self._pools[self._key(event.address)]["cleared"] += 1
+
+    def pool_closed(self, event):
+        with self._lock:
+            self._pools.pop(self._key(event.address), None)
+
+    def connection_created(self, event):
+        with self._lock:
+            self._pools[self._key(event.address)]["open"] += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            stats = self._pools[self._key(event.address)]
+            stats["open"] = max(0, stats["open"] - 1)
+
+    def connection_check_out_started(self, event):
+        self._waits.started = time.perf_counter()
+
+    def connection_check_out_failed(self, event):
+        self._finish_wait(event, failed=True)
+
+    def connection_checked_out(self, event):
+        self._finish_wait(event, failed=False)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            stats = self._pools[self._key(event.address)]
+            stats["checked_out"] = max(0, stats["checked_out"] - 1)
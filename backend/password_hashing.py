@@ -0,0 +1,43 @@
+# bcrypt hashing on a dedicated, bounded thread pool
+# Keeps the ~200ms bcrypt work off the event loop and sheds load instead of queueing forever.
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing pool already has ``max_pending`` jobs in flight."""
+
+
+class PasswordHasher:
+    def __init__(self, workers: int = 2, max_queue: int = 32, rounds: int = 12):
+        self.rounds = rounds
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        # Running jobs plus jobs waiting for a worker
+        self._max_pending = workers + max_queue
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def hash(self, password: str) -> str:
+        hashed = await self._run(bcrypt.hashpw, password.encode(), bcrypt.gensalt(rounds=self.rounds))
+        return hashed.decode()
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        return await self._run(bcrypt.checkpw, password.encode(), hashed.encode())
+
+    async def _run(self, fn, *args):
+        if self._pending >= self._max_pending:
+            raise PasswordHasherBusy()
+        self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self._pending -= 1
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
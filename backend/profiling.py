@@ -0,0 +1,131 @@
+# Opt-in, request-scoped profiling
+# A request is profiled when it carries X-Profile with the admin token, or when it falls
+# in the sampling rate. pyinstrument (HTML flame/timeline view) is used when installed,
+# cProfile (.prof, for snakeviz / pstats) otherwise. When profiling is disabled the
+# middleware is simply not installed, so it costs nothing.
+
+import asyncio
+import cProfile
+import hmac
+import logging
+import random
+import re
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    from pyinstrument import Profiler
+except ImportError:  # optional: falls back to cProfile
+    Profiler = None
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "x-profile"
+PROFILE_NAME_RE = re.compile(r"^[\w.-]+\.(html|prof)$")
+
+
+def token_matches(supplied: Optional[str], expected: Optional[str]) -> bool:
+    # Compared as bytes: compare_digest rejects non-ASCII str, and headers are decoded as latin-1
+    return bool(expected) and bool(supplied) and hmac.compare_digest(supplied.encode(), expected.encode())
+
+
+def list_profiles(directory: Path) -> List[dict]:
+    """Newest first."""
+    if not directory.is_dir():
+        return []
+    profiles = [
+        {"name": path.name, "size": stat.st_size, "created_at": datetime.fromtimestamp(stat.st_mtime, timezone.utc)}
+        for path in directory.iterdir()
+        if PROFILE_NAME_RE.match(path.name)
+        for stat in (path.stat(),)
+    ]
+    profiles.sort(key=lambda p: p["created_at"], reverse=True)
+    return profiles
+
+
+def profile_path(directory: Path, name: str) -> Optional[Path]:
+    """Path of a stored profile, or None; ``name`` never escapes ``directory``."""
+    if not PROFILE_NAME_RE.match(name):
+        return None
+    path = directory / name
+    return path if path.is_file() else None
+
+
+class ProfilingMiddleware:
+    def __init__(
+        self,
+        app,
+        directory: Path,
+        admin_token: Optional[str] = None,
+        sample_rate: float = 0.0,
+        max_files: int = 200
+    ):
+        self.app = app
+        self.directory = Path(directory)
+        self.admin_token = admin_token
+        self.sample_rate = sample_rate
+        self.max_files = max_files
+        # The profilers hook the whole thread, so only one request is profiled at a time
+        self._busy = False
+
+    def _wanted(self, scope) -> bool:
+        supplied = Headers(scope=scope).get(PROFILE_HEADER)
+        if supplied is not None:
+            return token_matches(supplied, self.admin_token)
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self._busy or not self._wanted(scope):
+            await self.app(scope, receive, send)
+            return
+
+        self._busy = True
+        name = self._profile_name(scope)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)["X-Profile-Id"] = name
+            await send(message)
+
+        started = time.perf_counter()
+        if Profiler is not None:
+            profiler = Profiler(async_mode="enabled")
+            profiler.start()
+        else:
+            profiler = cProfile.Profile()
+            profiler.enable()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if Profiler is not None:
+                profiler.stop()
+            else:
+                profiler.disable()
+            self._busy = False
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            # Rendering a profile takes a while; keep it off the event loop
+            await asyncio.get_running_loop().run_in_executor(None, self._save, profiler, name, scope, elapsed_ms)
+
+    def _profile_name(self, scope) -> str:
+        slug = re.sub(r"[^\w]+", "_", scope["path"]).strip("_")[:60] or "root"
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+        extension = "html" if Profiler is not None else "prof"
+        return f"{stamp}_{scope['method']}_{slug}.{extension}"
+
+    def _save(self, profiler, name: str, scope, elapsed_ms: float) -> None:
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self.directory / name
+            if Profiler is not None:
+                path.write_text(profiler.output_html(), encoding="utf-8")
+            else:
+                profiler.dump_stats(path)
+            logger.info(f"Profiled {scope['method']} {scope['path']} ({elapsed_ms:.1f}ms) -> {path}")
+            for stale in list_profiles(self.directory)[self.max_files:]:
+                (self.directory / stale["name"]).unlink(missing_ok=True)
+        except Exception as e:
+            logger.error(f"Could not write profile {name}: {e}")
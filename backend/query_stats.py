@@ -0,0 +1,168 @@
+# MongoDB command timing, aggregated per query shape and route
+# A query shape keeps the structure of a command and drops every value, e.g.
+#   tastings.find{$or[{created_at{$lt}},{created_at,tasting_id{$lt}}],user_id}.sort(created_at,tasting_id)
+# so statistics group identical queries and the slow-query log never contains user data.
+
+import logging
+import threading
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+from pymongo import monitoring
+
+from metrics import current_route
+
+logger = logging.getLogger(__name__)
+
+# Driver chatter that says nothing about the application's queries
+IGNORED_COMMANDS = {
+    "hello", "ismaster", "isMaster", "ping", "buildInfo", "buildinfo", "saslStart", "saslContinue",
+    "endSessions", "killCursors", "getLastError", "abortTransaction", "commitTransaction",
+}
+# Shapes are bounded by the code paths issuing them, but cap them all the same
+MAX_SHAPES = 500
+OVERFLOW_SHAPE = "other"
+
+
+def filter_shape(value: Any) -> str:
+    """Structure of a filter with every value dropped: {user_id,vintage{$gte,$lte}}."""
+    if isinstance(value, dict):
+        parts = []
+        for key in sorted(value):
+            inner = value[key]
+            if isinstance(inner, (dict, list)) and (key.startswith("$") or _has_operators(inner)):
+                parts.append(f"{key}{filter_shape(inner)}")
+            else:
+                parts.append(key)
+        return "{" + ",".join(parts) + "}"
+    if isinstance(value, list):
+        shapes = []
+        for item in value:
+            shape = filter_shape(item) if isinstance(item, (dict, list)) else ""
+            if shape and shape not in shapes:
+                shapes.append(shape)
+        return "[" + ",".join(shapes) + "]"
+    return ""
+
+
+def _has_operators(value: Any) -> bool:
+    if isinstance(value, dict):
+        return any(key.startswith("$") for key in value)
+    return any(isinstance(item, dict) for item in value)
+
+
+def _sort_shape(sort: Optional[dict]) -> str:
+    return f".sort({','.join(sort)})" if sort else ""
+
+
+def command_shape(command_name: str, command: dict) -> str:
+    collection = command.get(command_name)
+    if not isinstance(collection, str):
+        collection = command.get("collection", "")
+    prefix = f"{collection}.{command_name}"
+
+    if command_name == "find":
+        return prefix + filter_shape(command.get("filter", {})) + _sort_shape(command.get("sort"))
+    if command_name in ("count", "findAndModify"):
+        return prefix + filter_shape(command.get("query", {})) + _sort_shape(command.get("sort"))
+    if command_name == "distinct":
+        return f"{prefix}({command.get('key')})" + filter_shape(command.get("query", {}))
+    if command_name == "aggregate":
+        stages = []
+        for stage in command.get("pipeline", []):
+            for operator, spec in stage.items():
+                if operator == "$match":
+                    stages.append(operator + filter_shape(spec))
+                elif operator == "$sort":
+                    stages.append(f"$sort({','.join(spec)})")
+                else:
+                    stages.append(operator)
+        return f"{prefix}[{','.join(stages)}]"
+    if command_name == "update":
+        return prefix + filter_shape([u.get("q", {}) for u in command.get("updates", [])])
+    if command_name == "delete":
+        return prefix + filter_shape([d.get("q", {}) for d in command.get("deletes", [])])
+    return prefix
+
+
+def _documents_returned(reply: dict) -> int:
+    cursor = reply.get("cursor")
+    if isinstance(cursor, dict):
+        return len(cursor.get("firstBatch", cursor.get("nextBatch", [])))
+    if "values" in reply:
+        return len(reply["values"])
+    return int(reply.get("n", 0) or 0)
+
+
+class QueryStats(monitoring.CommandListener):
+    """Per (route, shape) call counts, durations and documents returned; slow commands are logged.
+
+    Commands run on Motor's worker threads (with the request's context copied over), so
+    the route label comes from a context variable and updates are locked.
+    """
+
+    def __init__(self, slow_threshold_ms: float = 100.0):
+        self.slow_threshold_ms = slow_threshold_ms
+        self._lock = threading.Lock()
+        self._pending: Dict[tuple, tuple] = {}
+        self._stats: Dict[tuple, Dict[str, float]] = defaultdict(lambda: {
+            "count": 0,
+            "failures": 0,
+            "total_seconds": 0.0,
+            "max_seconds": 0.0,
+            "docs_returned": 0,
+        })
+
+    def started(self, event):
+        if event.command_name in IGNORED_COMMANDS:
+            return
+        shape = command_shape(event.command_name, event.command)
+        with self._lock:
+            self._pending[(event.connection_id, event.request_id)] = (current_route.get(), shape)
+
+    def _finish(self, event, docs: int, failed: bool) -> Optional[tuple]:
+        with self._lock:
+            pending = self._pending.pop((event.connection_id, event.request_id), None)
+            if pending is None:
+                return None
+            route, shape = pending
+            if (route, shape) not in self._stats and len(self._stats) >= MAX_SHAPES:
+                shape = OVERFLOW_SHAPE
+            seconds = event.duration_micros / 1e6
+            stats = self._stats[(route, shape)]
+            stats["count"] += 1
+            stats["failures"] += failed
+            stats["total_seconds"] += seconds
+            stats["max_seconds"] = max(stats["max_seconds"], seconds)
+            stats["docs_returned"] += docs
+            return route, shape
+
+    def succeeded(self, event):
+        docs = _documents_returned(event.reply)
+        finished = self._finish(event, docs, failed=False)
+        if finished and event.duration_micros / 1000 >= self.slow_threshold_ms:
+            route, shape = finished
+            logger.warning(f"Slow query {event.duration_micros / 1000:.1f}ms route={route} {shape} docs={docs}")
+
+    def failed(self, event):
+        finished = self._finish(event, 0, failed=True)
+        if finished:
+            route, shape = finished
+            # errmsg can quote document values (duplicate keys...), so only the error code is logged
+            logger.warning(f"Failed query route={route} {shape}: {event.failure.get('codeName', event.failure.get('code'))}")
+
+    def snapshot(self, limit: Optional[int] = 50, sort_by: str = "total_seconds") -> List[dict]:
+        """Heaviest (route, shape) pairs first."""
+        with self._lock:
+            rows = [
+                {"route": route, "shape": shape, **stats}
+                for (route, shape), stats in self._stats.items()
+            ]
+        rows.sort(key=lambda row: row.get(sort_by, 0), reverse=True)
+        for row in rows:
+            row["avg_ms"] = round(row["total_seconds"] * 1000 / row["count"], 3) if row["count"] else 0.0
+        return rows[:limit]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
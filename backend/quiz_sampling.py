@@ -0,0 +1,87 @@
+# Randomised quiz question selection, stratified by lesson
+# Per-track question ids are grouped by lesson once per catalog snapshot; a quiz draws
+# from every lesson in proportion to its size, so a growing track is sampled evenly
+# instead of always serving the first questions inserted.
+
+import random
+from collections import defaultdict
+from typing import Collection, Dict, List, Optional
+
+# Stratum of questions that are not tied to a lesson
+NO_LESSON = ""
+
+
+class QuizPool:
+    """track_id -> lesson_id -> sorted question ids, built from a CatalogSnapshot."""
+
+    def __init__(self, questions: List[dict]):
+        strata: Dict[str, Dict[str, List[str]]] = defaultdict(lambda: defaultdict(list))
+        for question in questions:
+            strata[question["track_id"]][question.get("lesson_id") or NO_LESSON].append(question["question_id"])
+        # Sorted, so that a seed selects the same questions whatever order the storage returned
+        self.strata = {
+            track_id: {lesson_id: sorted(ids) for lesson_id, ids in sorted(lessons.items())}
+            for track_id, lessons in strata.items()
+        }
+
+    def sample(
+        self,
+        track_id: str,
+        limit: int,
+        seed: Optional[int] = None,
+        exclude: Collection[str] = ()
+    ) -> List[str]:
+        """Up to ``limit`` question ids of the track, in random order.
+
+        ``exclude`` (e.g. recently answered correctly) is avoided, but used to top up the
+        quiz when the track has too few other questions. With ``seed`` the result is
+        reproducible for the same catalog and exclusions.
+        """
+        rng = random.Random(seed)
+        exclude = set(exclude)
+        lessons = self.strata.get(track_id, {})
+        eligible = {
+            lesson_id: [qid for qid in ids if qid not in exclude]
+            for lesson_id, ids in lessons.items()
+        }
+        eligible = {lesson_id: ids for lesson_id, ids in eligible.items() if ids}
+
+        chosen = []
+        for lesson_id, quota in _allocate(eligible, limit, rng).items():
+            chosen += rng.sample(eligible[lesson_id], quota)
+
+        if len(chosen) < limit:
+            excluded = [qid for ids in lessons.values() for qid in ids if qid in exclude]
+            chosen += rng.sample(excluded, min(limit - len(chosen), len(excluded)))
+
+        rng.shuffle(chosen)
+        return chosen
+
+
+def build_quiz_pool(snapshot) -> QuizPool:
+    return QuizPool(snapshot.all("quiz_questions"))
+
+
+def _allocate(strata: Dict[str, List[str]], limit: int, rng: random.Random) -> Dict[str, int]:
+    """Questions to draw per stratum: one from each (while the limit allows), the rest in
+    proportion to stratum size, rounded by largest remainder."""
+    total = sum(len(ids) for ids in strata.values())
+    limit = min(limit, total)
+    if limit <= 0:
+        return {}
+    if limit < len(strata):
+        return {lesson_id: 1 for lesson_id in rng.sample(sorted(strata), limit)}
+
+    quotas = {lesson_id: 1 for lesson_id in strata}
+    remaining = limit - len(strata)
+    spare = {lesson_id: len(ids) - 1 for lesson_id, ids in strata.items()}
+    spare_total = sum(spare.values())
+    if remaining and spare_total:
+        shares = {lesson_id: remaining * count / spare_total for lesson_id, count in spare.items()}
+        for lesson_id, share in shares.items():
+            quotas[lesson_id] += int(share)
+        leftover = limit - sum(quotas.values())
+        by_remainder = sorted(shares, key=lambda lesson_id: (shares[lesson_id] - int(shares[lesson_id]), lesson_id), reverse=True)
+        for lesson_id in by_remainder[:leftover]:
+            quotas[lesson_id] += 1
+    return quotas
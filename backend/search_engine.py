@@ -0,0 +1,172 @@
+# In-memory full-text search over the WineStudy catalog
+# Accent-folded, lightly stemmed (pt + en) inverted index ranked with BM25.
+
+import heapq
+import math
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+# The last query term also matches vocabulary terms it is a prefix of ("bord" -> "bordeaux")
+MAX_PREFIX_EXPANSIONS = 50
+PREFIX_MATCH_WEIGHT = 0.6
+
+STOPWORDS = {
+    # en
+    "a", "an", "and", "are", "as", "at", "by", "for", "from", "in", "is", "it", "its", "of", "on",
+    "or", "the", "to", "with",
+    # pt
+    "ao", "aos", "as", "com", "da", "das", "de", "do", "dos", "e", "em", "na", "nas", "no", "nos",
+    "o", "os", "ou", "para", "por", "que", "se", "um", "uma",
+}
+
+# (suffix, replacement), longest first; applied once, only if the stem keeps >= 3 chars
+SUFFIX_RULES = [
+    # pt (already accent-folded)
+    ("coes", "cao"), ("soes", "sao"), ("mente", ""), ("oes", "ao"), ("aes", "ao"),
+    ("ais", "al"), ("eis", "el"), ("ois", "ol"),
+    # en
+    ("ies", "y"),
+    # shared plural
+    ("s", ""),
+]
+
+# Searchable fields per document type, with their BM25F-style weights
+SEARCH_FIELDS: Dict[str, Dict[str, float]] = {
+    "grape": {
+        "name": 4.0, "description_pt": 1.0, "description_en": 1.0,
+        "aromatic_notes": 1.5, "flavor_notes": 1.5, "best_regions": 1.5,
+    },
+    "region": {
+        "name": 4.0, "name_pt": 4.0, "name_en": 4.0, "description_pt": 1.0, "description_en": 1.0,
+        "key_grapes": 1.5, "main_grapes": 1.5,
+    },
+    "country": {"name_pt": 4.0, "name_en": 4.0, "description_pt": 1.0, "description_en": 1.0},
+    "aroma": {"name_pt": 4.0, "name_en": 4.0, "category": 1.0},
+    "lesson": {"title_pt": 3.0, "title_en": 3.0, "content_pt": 0.5, "content_en": 0.5},
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def fold(text: str) -> str:
+    """Lowercase and strip accents: "Sémillon" -> "semillon", "Ródano" -> "rodano"."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def stem(token: str) -> str:
+    for suffix, replacement in SUFFIX_RULES:
+        if token.endswith(suffix) and len(token) - len(suffix) + len(replacement) >= 3:
+            return token[: -len(suffix)] + replacement
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN_RE.findall(fold(text)) if t not in STOPWORDS]
+
+
+def analyze(text: str) -> List[str]:
+    return [stem(t) for t in tokenize(text)]
+
+
+def _field_text(value) -> str:
+    if isinstance(value, list):
+        return " ".join(str(v) for v in value)
+    return str(value) if value is not None else ""
+
+
+class SearchIndex:
+    """BM25 over weighted fields; documents are (type, id, doc) tuples."""
+
+    def __init__(self, documents: Iterable[Tuple[str, str, dict]]):
+        self.documents: List[Tuple[str, str, dict]] = []
+        self._postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        self._lengths: List[float] = []
+        # Unstemmed token -> stem, for prefix matching on what the user actually typed
+        surface_forms: Dict[str, str] = {}
+
+        for doc_type, doc_id, doc in documents:
+            position = len(self.documents)
+            self.documents.append((doc_type, doc_id, doc))
+            length = 0.0
+            for field, weight in SEARCH_FIELDS[doc_type].items():
+                for token in tokenize(_field_text(doc.get(field))):
+                    term = surface_forms.setdefault(token, stem(token))
+                    postings = self._postings[term]
+                    postings[position] = postings.get(position, 0.0) + weight
+                    length += weight
+            self._lengths.append(length)
+
+        self._avg_length = (sum(self._lengths) / len(self._lengths)) if self._lengths else 0.0
+        self._surface_forms = surface_forms
+        self._vocabulary = sorted(surface_forms)
+
+    def _idf(self, term: str) -> float:
+        n = len(self.documents)
+        df = len(self._postings.get(term, ()))
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def _prefix_terms(self, prefix: str) -> List[str]:
+        start = bisect_left(self._vocabulary, prefix)
+        terms = []
+        for token in self._vocabulary[start:start + MAX_PREFIX_EXPANSIONS]:
+            if not token.startswith(prefix):
+                break
+            terms.append(self._surface_forms[token])
+        return terms
+
+    def _query_terms(self, query: str) -> Dict[str, float]:
+        """Analyzed query terms with their weights; the last raw token also expands as a prefix."""
+        tokens = tokenize(query)
+        terms = {stem(token): 1.0 for token in tokens}
+        if tokens:
+            for term in self._prefix_terms(tokens[-1]):
+                terms.setdefault(term, PREFIX_MATCH_WEIGHT)
+        return terms
+
+    def search(
+        self,
+        query: str,
+        doc_types: Optional[Iterable[str]] = None,
+        limit: int = 20,
+        offset: int = 0
+    ) -> Tuple[int, List[Tuple[float, str, str, dict]]]:
+        """Return (total hits, [(score, type, id, doc)]) for one page, best first."""
+        allowed = set(doc_types) if doc_types else None
+        scores: Dict[int, float] = defaultdict(float)
+        for term, query_weight in self._query_terms(query).items():
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = self._idf(term)
+            for position, tf in postings.items():
+                if allowed and self.documents[position][0] not in allowed:
+                    continue
+                norm = K1 * (1 - B + B * self._lengths[position] / self._avg_length)
+                scores[position] += query_weight * idf * tf * (K1 + 1) / (tf + norm)
+
+        top = heapq.nlargest(offset + limit, scores.items(), key=lambda item: (item[1], -item[0]))
+        page = [(round(score, 4), *self.documents[position]) for position, score in top[offset:]]
+        return len(scores), page
+
+
+def build_search_index(snapshot) -> SearchIndex:
+    """Index every searchable catalog collection of a CatalogSnapshot."""
+    sources = [
+        ("grape", "grapes", "grape_id"),
+        ("region", "regions", "region_id"),
+        ("country", "countries", "country_id"),
+        ("aroma", "aroma_tags", "tag_id"),
+        ("lesson", "lessons", "lesson_id"),
+    ]
+    return SearchIndex(
+        (doc_type, doc[key], doc)
+        for doc_type, collection, key in sources
+        for doc in snapshot.all(collection)
+    )
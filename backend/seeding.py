@@ -0,0 +1,103 @@
+# Idempotent, diff-based seeding of the catalog collections
+# Every seeded document is hashed; a reseed only writes documents whose hash changed, as
+# per-document upserts, so a collection is never emptied while it is being refreshed.
+
+import hashlib
+import json
+import logging
+from typing import Dict, Iterable, List
+
+from catalog_cache import CATALOG_COLLECTIONS
+
+logger = logging.getLogger(__name__)
+
+# Seed sources and their precedence: a document owned by a higher-ranked source (the
+# "complete" data sets) is never overwritten or re-created by a lower-ranked one.
+SEED_SOURCES = {
+    "base": 0,
+    "expand": 0,
+    "expand_advanced": 0,
+    "complete_grapes": 1,
+    "complete_regions": 1,
+}
+
+
+class SeedSourceError(ValueError):
+    pass
+
+
+def content_hash(doc: dict) -> str:
+    canonical = json.dumps(doc, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+async def apply_seed(store, collection: str, docs: List[dict], source: str, prune: bool = False) -> Dict[str, int]:
+    """Bring ``collection`` in line with ``docs`` from ``source``, writing only the differences.
+
+    With ``prune``, ``source`` is authoritative for the whole collection: documents that
+    are not in ``docs`` and are not owned by a higher-ranked source are deleted, and a
+    tombstone stops lower-ranked sources from re-creating them. ``store`` is a
+    storage.CatalogRepository.
+    """
+    if source not in SEED_SOURCES:
+        raise SeedSourceError(f"Unknown seed source: {source}")
+    rank = SEED_SOURCES[source]
+    key_field = CATALOG_COLLECTIONS[collection]
+
+    manifest = {entry["key"]: entry for entry in await store.manifest(collection)}
+
+    def outranked(key: str) -> bool:
+        owner = manifest.get(key)
+        return owner is not None and SEED_SOURCES.get(owner["source"], 0) > rank
+
+    counts = {"inserted": 0, "updated": 0, "unchanged": 0, "skipped": 0, "deleted": 0}
+    upserts, deletes, manifest_entries = [], [], []
+    wanted = set()
+
+    for doc in docs:
+        doc = {k: v for k, v in doc.items() if k != "_id"}
+        key = doc[key_field]
+        wanted.add(key)
+        if outranked(key):
+            counts["skipped"] += 1
+            continue
+        digest = content_hash(doc)
+        entry = manifest.get(key)
+        if entry and entry["source"] == source and entry["hash"] == digest and not entry.get("tombstone"):
+            counts["unchanged"] += 1
+            continue
+        upserts.append(doc)
+        manifest_entries.append(
+            {"collection": collection, "key": key, "source": source, "hash": digest, "tombstone": False}
+        )
+        counts["updated" if entry and not entry.get("tombstone") else "inserted"] += 1
+
+    if prune:
+        # Unowned documents predate the pipeline and are treated like lower-ranked ones
+        stored_keys = {doc[key_field] for doc in await store.documents(collection) if key_field in doc}
+        for key in stored_keys - wanted:
+            if outranked(key):
+                continue
+            deletes.append(key)
+            manifest_entries.append(
+                {"collection": collection, "key": key, "source": source, "hash": None, "tombstone": True}
+            )
+            counts["deleted"] += 1
+
+    if upserts or deletes or manifest_entries:
+        await store.apply_seed(collection, upserts, deletes, manifest_entries)
+    return counts
+
+
+async def seed_collections(store, source: str, documents: Dict[str, List[dict]], prune: Iterable[str] = ()) -> Dict[str, Dict[str, int]]:
+    """apply_seed() for several collections of one source; ``prune`` names the authoritative ones."""
+    prune = set(prune)
+    results = {}
+    for collection, docs in documents.items():
+        results[collection] = await apply_seed(store, collection, docs, source, prune=collection in prune)
+    logger.info(f"Seed {source}: {results}")
+    return results
+
+
+def has_changes(results: Dict[str, Dict[str, int]]) -> bool:
+    return any(c["inserted"] or c["updated"] or c["deleted"] for c in results.values())
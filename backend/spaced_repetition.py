@@ -0,0 +1,82 @@
+# Spaced-repetition scheduling of quiz questions (SM-2)
+# Every answered question gets a per-user review state: ease factor, interval and the date
+# it is next due. Correct answers push the next review further out, wrong ones bring the
+# question back the next day.
+
+import bisect
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+# SM-2 grades answers 0-5; a quiz answer is only right or wrong
+QUALITY_CORRECT = 4
+QUALITY_INCORRECT = 1
+
+
+def new_state(user_id: str, question_id: str, track_id: str, now: datetime) -> dict:
+    return {
+        "user_id": user_id,
+        "question_id": question_id,
+        "track_id": track_id,
+        "ease": DEFAULT_EASE,
+        "interval_days": 0,
+        "repetitions": 0,
+        "lapses": 0,
+        "due_at": now,
+        "last_reviewed_at": None,
+    }
+
+
+def review(state: dict, quality: int, now: datetime) -> dict:
+    """State after an answer graded ``quality`` (0-5) at ``now``; ``state`` is not modified."""
+    state = dict(state)
+    if quality < 3:
+        state["repetitions"] = 0
+        state["interval_days"] = 1
+        state["lapses"] += 1
+    else:
+        state["repetitions"] += 1
+        if state["repetitions"] == 1:
+            state["interval_days"] = 1
+        elif state["repetitions"] == 2:
+            state["interval_days"] = 6
+        else:
+            state["interval_days"] = round(state["interval_days"] * state["ease"])
+    ease = state["ease"] + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02)
+    state["ease"] = round(max(MIN_EASE, ease), 3)
+    state["due_at"] = now + timedelta(days=state["interval_days"])
+    state["last_reviewed_at"] = now
+    return state
+
+
+class DueQueue:
+    """One user's questions sorted by due date.
+
+    Looking up the ``k`` earliest due questions is a bisection plus a slice, so it stays
+    cheap for users with thousands of answered questions.
+    """
+
+    def __init__(self):
+        self._entries: List[Tuple[datetime, str]] = []
+        self._due_by_question: Dict[str, datetime] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def put(self, question_id: str, due_at: datetime) -> None:
+        previous = self._due_by_question.get(question_id)
+        if previous is not None:
+            del self._entries[bisect.bisect_left(self._entries, (previous, question_id))]
+        bisect.insort(self._entries, (due_at, question_id))
+        self._due_by_question[question_id] = due_at
+
+    def due(self, now: datetime, limit: Optional[int] = None) -> List[str]:
+        """Question ids due at ``now``, most overdue first."""
+        end = bisect.bisect_right(self._entries, (now, "\U0010ffff"))
+        if limit is not None:
+            end = min(end, limit)
+        return [question_id for _, question_id in self._entries[:end]]
+
+    def count_due(self, now: datetime) -> int:
+        return bisect.bisect_right(self._entries, (now, "\U0010ffff"))
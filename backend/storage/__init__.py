@@ -0,0 +1,67 @@
+# Storage layer: users, sessions, tastings, progress, quiz, review and catalog repositories
+# The engine is chosen with STORAGE_BACKEND: "mongo" (default), "postgres" or "memory".
+
+from typing import Mapping, Sequence
+
+from storage.base import (
+    CatalogRepository,
+    ProgressRepository,
+    QuizRepository,
+    ReviewRepository,
+    SessionRepository,
+    Storage,
+    TastingRepository,
+    UserRepository,
+)
+from storage.memory import MemoryStorage
+
+STORAGE_BACKENDS = ("mongo", "postgres", "memory")
+
+__all__ = [
+    "CatalogRepository",
+    "MemoryStorage",
+    "ProgressRepository",
+    "QuizRepository",
+    "ReviewRepository",
+    "STORAGE_BACKENDS",
+    "SessionRepository",
+    "Storage",
+    "TastingRepository",
+    "UserRepository",
+    "create_storage",
+]
+
+
+def create_storage(environ: Mapping[str, str], event_listeners: Sequence = ()) -> Storage:
+    """Storage engine configured by the environment.
+
+    mongo: MONGO_URL, DB_NAME and the MONGO_* pool settings; ``event_listeners`` are
+    pymongo monitoring listeners. postgres: DATABASE_URL, POSTGRES_POOL_MIN/MAX_SIZE.
+    """
+    backend = environ.get("STORAGE_BACKEND", "mongo")
+    if backend == "mongo":
+        from motor.motor_asyncio import AsyncIOMotorClient
+        from pymongo import ReadPreference
+
+        from mongo_pool import client_options, read_preference
+        from storage.mongo import MongoStorage
+
+        client = AsyncIOMotorClient(environ["MONGO_URL"], event_listeners=list(event_listeners), **client_options(environ))
+        return MongoStorage(
+            client,
+            # User data (tastings, user_progress, sessions...) is always read from the primary
+            client.get_database(environ["DB_NAME"], read_preference=ReadPreference.PRIMARY),
+            catalog_read_preference=read_preference(environ.get("MONGO_CATALOG_READ_PREFERENCE", "secondaryPreferred"))
+        )
+    if backend == "postgres":
+        # asyncpg is only needed by this engine
+        from storage.postgres import PostgresStorage
+
+        return PostgresStorage(
+            environ["DATABASE_URL"],
+            min_size=int(environ.get("POSTGRES_POOL_MIN_SIZE", "1")),
+            max_size=int(environ.get("POSTGRES_POOL_MAX_SIZE", "10"))
+        )
+    if backend == "memory":
+        return MemoryStorage()
+    raise ValueError(f"Unknown STORAGE_BACKEND: {backend} (expected one of {', '.join(STORAGE_BACKENDS)})")
@@ -0,0 +1,168 @@
+# Storage interfaces shared by every engine
+# Handlers only see these repositories; documents go in and come out as plain dicts shaped
+# like the MongoDB documents (ISO-8601 strings for timestamps), whatever the engine.
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+
+class UserRepository(ABC):
+    @abstractmethod
+    async def get(self, user_id: str) -> Optional[dict]: ...
+
+    @abstractmethod
+    async def get_by_email(self, email: str) -> Optional[dict]: ...
+
+    @abstractmethod
+    async def create(self, user: dict) -> None: ...
+
+    @abstractmethod
+    async def update(self, user_id: str, fields: Dict[str, Any]) -> None: ...
+
+
+class SessionRepository(ABC):
+    """OAuth sessions; ``expires_at`` is a datetime (the Mongo TTL index needs a date)."""
+
+    @abstractmethod
+    async def get(self, session_token: str) -> Optional[dict]: ...
+
+    @abstractmethod
+    async def create(self, session: dict) -> None: ...
+
+    @abstractmethod
+    async def delete(self, session_token: str) -> None: ...
+
+
+class TastingRepository(ABC):
+    @abstractmethod
+    async def create(self, tasting: dict) -> None: ...
+
+    @abstractmethod
+    async def get(self, user_id: str, tasting_id: str) -> Optional[dict]: ...
+
+    @abstractmethod
+    async def delete(self, user_id: str, tasting_id: str) -> bool:
+        """False when the user has no such tasting."""
+
+    @abstractmethod
+    async def list(
+        self,
+        user_id: str,
+        limit: int,
+        after: Optional[Tuple[str, str]] = None,
+        grape_ids: Optional[List[str]] = None,
+        region_id: Optional[str] = None,
+        vintage_min: Optional[int] = None,
+        vintage_max: Optional[int] = None,
+        fields: Optional[Set[str]] = None
+    ) -> List[dict]:
+        """Newest first on (created_at, tasting_id), strictly after the ``after`` key.
+
+        With ``fields``, documents only carry those fields.
+        """
+
+
+class ProgressRepository(ABC):
+    @abstractmethod
+    async def get(self, user_id: str) -> Optional[dict]: ...
+
+    @abstractmethod
+    async def create(self, progress: dict) -> None: ...
+
+    @abstractmethod
+    async def add_tastings(self, user_id: str, amount: int) -> None: ...
+
+    @abstractmethod
+    async def complete_lesson(self, user_id: str, lesson_id: str, at: str) -> None: ...
+
+
+class QuizRepository(ABC):
+    @abstractmethod
+    async def add_scores(
+        self,
+        user_id: str,
+        scores: Dict[str, int],
+        recent_correct: Sequence[str] = (),
+        keep_recent: int = 50
+    ) -> None:
+        """Add to the user's per-track quiz scores (track_id -> points) and append
+        ``recent_correct`` question ids to the last ``keep_recent`` correct answers."""
+
+    @abstractmethod
+    async def recent_correct(self, user_id: str) -> List[str]:
+        """Questions the user recently answered correctly, oldest first."""
+
+
+class ReviewRepository(ABC):
+    """Spaced-repetition state per (user, question); ``due_at`` and ``last_reviewed_at``
+    are datetimes, as due-date queries compare them."""
+
+    @abstractmethod
+    async def get_many(self, user_id: str, question_ids: Iterable[str]) -> Dict[str, dict]:
+        """question_id -> review state, for the questions that have one."""
+
+    @abstractmethod
+    async def save_many(self, states: List[dict]) -> None:
+        """Insert or replace review states by (user_id, question_id)."""
+
+    @abstractmethod
+    async def due(self, user_id: str, now: datetime, limit: int, track_id: Optional[str] = None) -> List[dict]:
+        """States due at ``now``, most overdue first."""
+
+    @abstractmethod
+    async def count_due(self, user_id: str, now: datetime, track_id: Optional[str] = None) -> int: ...
+
+
+class CatalogRepository(ABC):
+    """Reference catalog collections, their version and the seeding manifest."""
+
+    @abstractmethod
+    async def load_if_changed(self, known_version: Optional[str]) -> Tuple[str, Optional[Dict[str, List[dict]]]]:
+        """Stored catalog version (created on first use) and, when it differs from
+        ``known_version``, every catalog collection read consistently with it."""
+
+    @abstractmethod
+    async def set_version(self, version: str) -> None: ...
+
+    @abstractmethod
+    async def documents(self, collection: str) -> List[dict]: ...
+
+    @abstractmethod
+    async def manifest(self, collection: str, source: Optional[str] = None) -> List[dict]:
+        """Seed manifest entries: {collection, key, source, hash, tombstone}."""
+
+    @abstractmethod
+    async def apply_seed(
+        self,
+        collection: str,
+        upserts: List[dict],
+        deletes: Iterable[str],
+        manifest_entries: List[dict]
+    ) -> None:
+        """Replace or insert ``upserts`` by key, delete ``deletes`` keys, then record the manifest."""
+
+    @abstractmethod
+    async def refresh_lesson_counts(self) -> None:
+        """Set study_tracks.lessons_count from the lessons actually stored for each track."""
+
+
+class Storage(ABC):
+    name: str
+
+    users: UserRepository
+    sessions: SessionRepository
+    tastings: TastingRepository
+    progress: ProgressRepository
+    quiz: QuizRepository
+    reviews: ReviewRepository
+    catalog: CatalogRepository
+
+    async def ensure_schema(self) -> None:
+        """Create indexes/tables; run in the background on startup."""
+
+    def schema_status(self) -> Dict[str, Any]:
+        return {"state": "ready", "indexes": []}
+
+    async def close(self) -> None:
+        pass
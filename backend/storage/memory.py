@@ -0,0 +1,263 @@
+# In-process storage engine
+# Zero-latency backend for benchmarks and tests: state lives in dicts and is lost on restart.
+# Documents are copied on the way in and out, so callers can no more mutate stored state
+# than they could with a database.
+
+import copy
+import uuid
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from catalog_cache import CATALOG_COLLECTIONS
+from spaced_repetition import DueQueue
+from storage.base import (
+    CatalogRepository,
+    ProgressRepository,
+    QuizRepository,
+    ReviewRepository,
+    SessionRepository,
+    Storage,
+    TastingRepository,
+    UserRepository,
+)
+
+
+class MemoryUserRepository(UserRepository):
+    def __init__(self):
+        self._users: Dict[str, dict] = {}
+        self._ids_by_email: Dict[str, str] = {}
+
+    async def get(self, user_id: str) -> Optional[dict]:
+        user = self._users.get(user_id)
+        return copy.deepcopy(user) if user else None
+
+    async def get_by_email(self, email: str) -> Optional[dict]:
+        user_id = self._ids_by_email.get(email)
+        return await self.get(user_id) if user_id else None
+
+    async def create(self, user: dict) -> None:
+        if user["email"] in self._ids_by_email:
+            raise ValueError(f"Duplicate email: {user['email']}")
+        self._users[user["user_id"]] = copy.deepcopy(user)
+        self._ids_by_email[user["email"]] = user["user_id"]
+
+    async def update(self, user_id: str, fields: Dict[str, Any]) -> None:
+        user = self._users.get(user_id)
+        if user:
+            user.update(copy.deepcopy(fields))
+
+
+class MemorySessionRepository(SessionRepository):
+    def __init__(self):
+        self._sessions: Dict[str, dict] = {}
+
+    async def get(self, session_token: str) -> Optional[dict]:
+        session = self._sessions.get(session_token)
+        return dict(session) if session else None
+
+    async def create(self, session: dict) -> None:
+        self._sessions[session["session_token"]] = dict(session)
+
+    async def delete(self, session_token: str) -> None:
+        self._sessions.pop(session_token, None)
+
+
+class MemoryTastingRepository(TastingRepository):
+    def __init__(self):
+        # user_id -> tasting_id -> tasting
+        self._tastings: Dict[str, Dict[str, dict]] = defaultdict(dict)
+
+    async def create(self, tasting: dict) -> None:
+        self._tastings[tasting["user_id"]][tasting["tasting_id"]] = copy.deepcopy(tasting)
+
+    async def get(self, user_id: str, tasting_id: str) -> Optional[dict]:
+        tasting = self._tastings.get(user_id, {}).get(tasting_id)
+        return copy.deepcopy(tasting) if tasting else None
+
+    async def delete(self, user_id: str, tasting_id: str) -> bool:
+        return self._tastings.get(user_id, {}).pop(tasting_id, None) is not None
+
+    async def list(
+        self,
+        user_id: str,
+        limit: int,
+        after: Optional[Tuple[str, str]] = None,
+        grape_ids: Optional[List[str]] = None,
+        region_id: Optional[str] = None,
+        vintage_min: Optional[int] = None,
+        vintage_max: Optional[int] = None,
+        fields: Optional[Set[str]] = None
+    ) -> List[dict]:
+        wanted_grapes = set(grape_ids or ())
+
+        def matches(tasting: dict) -> bool:
+            if wanted_grapes and wanted_grapes.isdisjoint(tasting.get("grape_ids") or ()):
+                return False
+            if region_id and tasting.get("region_id") != region_id:
+                return False
+            vintage = tasting.get("vintage")
+            if vintage_min is not None and (vintage is None or vintage < vintage_min):
+                return False
+            if vintage_max is not None and (vintage is None or vintage > vintage_max):
+                return False
+            return after is None or (tasting["created_at"], tasting["tasting_id"]) < after
+
+        page = sorted(
+            (t for t in self._tastings.get(user_id, {}).values() if matches(t)),
+            key=lambda t: (t["created_at"], t["tasting_id"]),
+            reverse=True
+        )[:limit]
+        if fields:
+            return [{f: copy.deepcopy(t[f]) for f in fields if f in t} for t in page]
+        return copy.deepcopy(page)
+
+
+class MemoryProgressRepository(ProgressRepository):
+    def __init__(self):
+        self.records: Dict[str, dict] = {}
+
+    async def get(self, user_id: str) -> Optional[dict]:
+        progress = self.records.get(user_id)
+        return copy.deepcopy(progress) if progress else None
+
+    async def create(self, progress: dict) -> None:
+        self.records[progress["user_id"]] = copy.deepcopy(progress)
+
+    async def add_tastings(self, user_id: str, amount: int) -> None:
+        progress = self.records.get(user_id)
+        if progress:
+            progress["total_tastings"] = progress.get("total_tastings", 0) + amount
+
+    async def complete_lesson(self, user_id: str, lesson_id: str, at: str) -> None:
+        progress = self.records.get(user_id)
+        if progress:
+            completed = progress.setdefault("completed_lessons", [])
+            if lesson_id not in completed:
+                completed.append(lesson_id)
+            progress["last_activity"] = at
+
+
+class MemoryQuizRepository(QuizRepository):
+    def __init__(self, progress: MemoryProgressRepository):
+        self._progress = progress
+
+    async def add_scores(
+        self,
+        user_id: str,
+        scores: Dict[str, int],
+        recent_correct: Sequence[str] = (),
+        keep_recent: int = 50
+    ) -> None:
+        progress = self._progress.records.get(user_id)
+        if not progress:
+            return
+        quiz_scores = progress.setdefault("quiz_scores", {})
+        for track_id, points in scores.items():
+            quiz_scores[track_id] = quiz_scores.get(track_id, 0) + points
+        if recent_correct and keep_recent > 0:
+            progress["recent_correct"] = (progress.get("recent_correct", []) + list(recent_correct))[-keep_recent:]
+
+    async def recent_correct(self, user_id: str) -> List[str]:
+        return list(self._progress.records.get(user_id, {}).get("recent_correct", []))
+
+
+class MemoryReviewRepository(ReviewRepository):
+    def __init__(self):
+        # user_id -> question_id -> state, plus a due-date-sorted queue per user
+        self._states: Dict[str, Dict[str, dict]] = defaultdict(dict)
+        self._queues: Dict[str, DueQueue] = defaultdict(DueQueue)
+
+    async def get_many(self, user_id: str, question_ids: Iterable[str]) -> Dict[str, dict]:
+        states = self._states.get(user_id, {})
+        return {qid: dict(states[qid]) for qid in question_ids if qid in states}
+
+    async def save_many(self, states: List[dict]) -> None:
+        for state in states:
+            self._states[state["user_id"]][state["question_id"]] = dict(state)
+            self._queues[state["user_id"]].put(state["question_id"], state["due_at"])
+
+    async def due(self, user_id: str, now: datetime, limit: int, track_id: Optional[str] = None) -> List[dict]:
+        queue, states = self._queues.get(user_id), self._states.get(user_id, {})
+        if queue is None:
+            return []
+        if not track_id:
+            return [dict(states[qid]) for qid in queue.due(now, limit)]
+        due = (states[qid] for qid in queue.due(now))
+        return [dict(state) for state in due if state["track_id"] == track_id][:limit]
+
+    async def count_due(self, user_id: str, now: datetime, track_id: Optional[str] = None) -> int:
+        queue = self._queues.get(user_id)
+        if queue is None:
+            return 0
+        if not track_id:
+            return queue.count_due(now)
+        states = self._states[user_id]
+        return sum(1 for qid in queue.due(now) if states[qid]["track_id"] == track_id)
+
+
+class MemoryCatalogRepository(CatalogRepository):
+    def __init__(self):
+        # collection -> key -> document
+        self._collections: Dict[str, Dict[str, dict]] = {name: {} for name in CATALOG_COLLECTIONS}
+        self._manifest: Dict[Tuple[str, str], dict] = {}
+        self._version: Optional[str] = None
+
+    async def load_if_changed(self, known_version: Optional[str]) -> Tuple[str, Optional[Dict[str, List[dict]]]]:
+        if self._version is None:
+            self._version = uuid.uuid4().hex
+        if self._version == known_version:
+            return self._version, None
+        return self._version, {
+            name: copy.deepcopy(list(docs.values())) for name, docs in self._collections.items()
+        }
+
+    async def set_version(self, version: str) -> None:
+        self._version = version
+
+    async def documents(self, collection: str) -> List[dict]:
+        return copy.deepcopy(list(self._collections[collection].values()))
+
+    async def manifest(self, collection: str, source: Optional[str] = None) -> List[dict]:
+        return [
+            dict(entry) for (entry_collection, _), entry in self._manifest.items()
+            if entry_collection == collection and (source is None or entry["source"] == source)
+        ]
+
+    async def apply_seed(
+        self,
+        collection: str,
+        upserts: List[dict],
+        deletes: Iterable[str],
+        manifest_entries: List[dict]
+    ) -> None:
+        key_field = CATALOG_COLLECTIONS[collection]
+        documents = self._collections[collection]
+        for doc in upserts:
+            documents[doc[key_field]] = copy.deepcopy(doc)
+        for key in deletes:
+            documents.pop(key, None)
+        for entry in manifest_entries:
+            self._manifest[(collection, entry["key"])] = dict(entry)
+
+    async def refresh_lesson_counts(self) -> None:
+        counts = defaultdict(int)
+        for lesson in self._collections["lessons"].values():
+            counts[lesson.get("track_id")] += 1
+        for track_id, count in counts.items():
+            track = self._collections["study_tracks"].get(track_id)
+            if track:
+                track["lessons_count"] = count
+
+
+class MemoryStorage(Storage):
+    name = "memory"
+
+    def __init__(self):
+        self.users = MemoryUserRepository()
+        self.sessions = MemorySessionRepository()
+        self.tastings = MemoryTastingRepository()
+        self.progress = MemoryProgressRepository()
+        self.quiz = MemoryQuizRepository(self.progress)
+        self.reviews = MemoryReviewRepository()
+        self.catalog = MemoryCatalogRepository()
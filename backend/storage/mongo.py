@@ -0,0 +1,311 @@
+# MongoDB storage engine (Motor)
+
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from pymongo import DeleteOne, ReplaceOne, UpdateOne
+
+from catalog_cache import CATALOG_COLLECTIONS, CATALOG_META_ID
+from db_indexes import ensure_indexes, index_status
+from storage.base import (
+    CatalogRepository,
+    ProgressRepository,
+    QuizRepository,
+    ReviewRepository,
+    SessionRepository,
+    Storage,
+    TastingRepository,
+    UserRepository,
+)
+
+MANIFEST_COLLECTION = "seed_manifest"
+
+
+def _manifest_id(collection: str, key: str) -> str:
+    return f"{collection}:{key}"
+
+
+class MongoUserRepository(UserRepository):
+    def __init__(self, db):
+        self._users = db.users
+
+    async def get(self, user_id: str) -> Optional[dict]:
+        return await self._users.find_one({"user_id": user_id}, {"_id": 0})
+
+    async def get_by_email(self, email: str) -> Optional[dict]:
+        return await self._users.find_one({"email": email}, {"_id": 0})
+
+    async def create(self, user: dict) -> None:
+        await self._users.insert_one(dict(user))
+
+    async def update(self, user_id: str, fields: Dict[str, Any]) -> None:
+        await self._users.update_one({"user_id": user_id}, {"$set": fields})
+
+
+class MongoSessionRepository(SessionRepository):
+    def __init__(self, db):
+        self._sessions = db.user_sessions
+
+    async def get(self, session_token: str) -> Optional[dict]:
+        return await self._sessions.find_one({"session_token": session_token}, {"_id": 0})
+
+    async def create(self, session: dict) -> None:
+        await self._sessions.insert_one(dict(session))
+
+    async def delete(self, session_token: str) -> None:
+        await self._sessions.delete_one({"session_token": session_token})
+
+
+class MongoTastingRepository(TastingRepository):
+    def __init__(self, db):
+        self._tastings = db.tastings
+
+    async def create(self, tasting: dict) -> None:
+        await self._tastings.insert_one(dict(tasting))
+
+    async def get(self, user_id: str, tasting_id: str) -> Optional[dict]:
+        return await self._tastings.find_one({"tasting_id": tasting_id, "user_id": user_id}, {"_id": 0})
+
+    async def delete(self, user_id: str, tasting_id: str) -> bool:
+        result = await self._tastings.delete_one({"tasting_id": tasting_id, "user_id": user_id})
+        return result.deleted_count > 0
+
+    async def list(
+        self,
+        user_id: str,
+        limit: int,
+        after: Optional[Tuple[str, str]] = None,
+        grape_ids: Optional[List[str]] = None,
+        region_id: Optional[str] = None,
+        vintage_min: Optional[int] = None,
+        vintage_max: Optional[int] = None,
+        fields: Optional[Set[str]] = None
+    ) -> List[dict]:
+        query = {"user_id": user_id}
+        if grape_ids:
+            query["grape_ids"] = {"$in": grape_ids}
+        if region_id:
+            query["region_id"] = region_id
+        if vintage_min is not None or vintage_max is not None:
+            query["vintage"] = {}
+            if vintage_min is not None:
+                query["vintage"]["$gte"] = vintage_min
+            if vintage_max is not None:
+                query["vintage"]["$lte"] = vintage_max
+        if after:
+            created_at, tasting_id = after
+            query["$or"] = [
+                {"created_at": {"$lt": created_at}},
+                {"created_at": created_at, "tasting_id": {"$lt": tasting_id}}
+            ]
+
+        projection = {"_id": 0}
+        if fields:
+            projection.update({f: 1 for f in fields})
+        # Served by the user_id_created_at_tasting_id index
+        return await self._tastings.find(query, projection).sort(
+            [("created_at", -1), ("tasting_id", -1)]
+        ).to_list(limit)
+
+
+class MongoProgressRepository(ProgressRepository):
+    def __init__(self, db):
+        self._progress = db.user_progress
+
+    async def get(self, user_id: str) -> Optional[dict]:
+        return await self._progress.find_one({"user_id": user_id}, {"_id": 0})
+
+    async def create(self, progress: dict) -> None:
+        await self._progress.insert_one(dict(progress))
+
+    async def add_tastings(self, user_id: str, amount: int) -> None:
+        await self._progress.update_one({"user_id": user_id}, {"$inc": {"total_tastings": amount}})
+
+    async def complete_lesson(self, user_id: str, lesson_id: str, at: str) -> None:
+        await self._progress.update_one(
+            {"user_id": user_id},
+            {"$addToSet": {"completed_lessons": lesson_id}, "$set": {"last_activity": at}}
+        )
+
+
+class MongoQuizRepository(QuizRepository):
+    def __init__(self, db):
+        self._progress = db.user_progress
+
+    async def add_scores(
+        self,
+        user_id: str,
+        scores: Dict[str, int],
+        recent_correct: Sequence[str] = (),
+        keep_recent: int = 50
+    ) -> None:
+        update = {}
+        increments = {f"quiz_scores.{track_id}": points for track_id, points in scores.items() if points}
+        if increments:
+            update["$inc"] = increments
+        if recent_correct and keep_recent > 0:
+            # Capped in place: the array never outgrows keep_recent entries
+            update["$push"] = {"recent_correct": {"$each": list(recent_correct), "$slice": -keep_recent}}
+        if update:
+            await self._progress.update_one({"user_id": user_id}, update)
+
+    async def recent_correct(self, user_id: str) -> List[str]:
+        progress = await self._progress.find_one({"user_id": user_id}, {"_id": 0, "recent_correct": 1})
+        return (progress or {}).get("recent_correct", [])
+
+
+class MongoReviewRepository(ReviewRepository):
+    """Due cards come from the user_id_due_at index: a range scan returning only k documents."""
+
+    def __init__(self, db):
+        self._reviews = db.quiz_reviews
+
+    @staticmethod
+    def _state(doc: dict) -> dict:
+        # Motor returns naive UTC datetimes
+        for field in ("due_at", "last_reviewed_at"):
+            if isinstance(doc.get(field), datetime) and doc[field].tzinfo is None:
+                doc[field] = doc[field].replace(tzinfo=timezone.utc)
+        return doc
+
+    @staticmethod
+    def _due_query(user_id: str, now: datetime, track_id: Optional[str]) -> dict:
+        query = {"user_id": user_id, "due_at": {"$lte": now}}
+        if track_id:
+            query["track_id"] = track_id
+        return query
+
+    async def get_many(self, user_id: str, question_ids: Iterable[str]) -> Dict[str, dict]:
+        docs = await self._reviews.find(
+            {"user_id": user_id, "question_id": {"$in": list(question_ids)}}, {"_id": 0}
+        ).to_list(None)
+        return {doc["question_id"]: self._state(doc) for doc in docs}
+
+    async def save_many(self, states: List[dict]) -> None:
+        if states:
+            await self._reviews.bulk_write([
+                ReplaceOne({"user_id": state["user_id"], "question_id": state["question_id"]}, dict(state), upsert=True)
+                for state in states
+            ], ordered=False)
+
+    async def due(self, user_id: str, now: datetime, limit: int, track_id: Optional[str] = None) -> List[dict]:
+        docs = await self._reviews.find(self._due_query(user_id, now, track_id), {"_id": 0}).sort(
+            [("due_at", 1), ("question_id", 1)]
+        ).limit(limit).to_list(None)
+        return [self._state(doc) for doc in docs]
+
+    async def count_due(self, user_id: str, now: datetime, track_id: Optional[str] = None) -> int:
+        return await self._reviews.count_documents(self._due_query(user_id, now, track_id))
+
+
+class MongoCatalogRepository(CatalogRepository):
+    """With a ``read_preference`` (e.g. secondaryPreferred) the collections are loaded from
+    that member while the version is still read from the primary, in one causally
+    consistent session.
+    """
+
+    def __init__(self, db, read_preference=None):
+        self._db = db
+        self._read_preference = read_preference
+
+    @asynccontextmanager
+    async def _read_session(self):
+        if self._read_preference is None:
+            yield None
+            return
+        # A secondary only answers reads in this session once it has caught up with the
+        # version read from the primary, so a fresh version never pairs with stale data
+        async with await self._db.client.start_session(causal_consistency=True) as session:
+            yield session
+
+    async def _stored_version(self, session=None) -> str:
+        meta = await self._db.catalog_meta.find_one({"_id": CATALOG_META_ID}, session=session)
+        if meta:
+            return meta["version"]
+        # First run against an existing database: create the version document
+        await self._db.catalog_meta.update_one(
+            {"_id": CATALOG_META_ID},
+            {"$setOnInsert": {"version": uuid.uuid4().hex}},
+            upsert=True,
+            session=session
+        )
+        meta = await self._db.catalog_meta.find_one({"_id": CATALOG_META_ID}, session=session)
+        return meta["version"]
+
+    async def load_if_changed(self, known_version: Optional[str]) -> Tuple[str, Optional[Dict[str, List[dict]]]]:
+        async with self._read_session() as session:
+            version = await self._stored_version(session)
+            if version == known_version:
+                return version, None
+            collections = {}
+            for name in CATALOG_COLLECTIONS:
+                collection = self._db[name]
+                if self._read_preference is not None:
+                    collection = collection.with_options(read_preference=self._read_preference)
+                collections[name] = await collection.find({}, {"_id": 0}, session=session).to_list(None)
+            return version, collections
+
+    async def set_version(self, version: str) -> None:
+        await self._db.catalog_meta.update_one(
+            {"_id": CATALOG_META_ID},
+            {"$set": {"version": version}},
+            upsert=True
+        )
+
+    async def documents(self, collection: str) -> List[dict]:
+        return await self._db[collection].find({}, {"_id": 0}).to_list(None)
+
+    async def manifest(self, collection: str, source: Optional[str] = None) -> List[dict]:
+        query = {"collection": collection}
+        if source:
+            query["source"] = source
+        return await self._db[MANIFEST_COLLECTION].find(query, {"_id": 0}).to_list(None)
+
+    async def apply_seed(
+        self,
+        collection: str,
+        upserts: List[dict],
+        deletes: Iterable[str],
+        manifest_entries: List[dict]
+    ) -> None:
+        key_field = CATALOG_COLLECTIONS[collection]
+        writes = [ReplaceOne({key_field: doc[key_field]}, doc, upsert=True) for doc in upserts]
+        writes += [DeleteOne({key_field: key}) for key in deletes]
+        # Documents first, then the manifest: an interrupted run is simply redone next time
+        if writes:
+            await self._db[collection].bulk_write(writes, ordered=False)
+        if manifest_entries:
+            await self._db[MANIFEST_COLLECTION].bulk_write([
+                UpdateOne({"_id": _manifest_id(collection, entry["key"])}, {"$set": entry}, upsert=True)
+                for entry in manifest_entries
+            ], ordered=False)
+
+    async def refresh_lesson_counts(self) -> None:
+        async for row in self._db.lessons.aggregate([{"$group": {"_id": "$track_id", "count": {"$sum": 1}}}]):
+            await self._db.study_tracks.update_one({"track_id": row["_id"]}, {"$set": {"lessons_count": row["count"]}})
+
+
+class MongoStorage(Storage):
+    name = "mongo"
+
+    def __init__(self, client, db, catalog_read_preference=None):
+        self.client = client
+        self.db = db
+        self.users = MongoUserRepository(db)
+        self.sessions = MongoSessionRepository(db)
+        self.tastings = MongoTastingRepository(db)
+        self.progress = MongoProgressRepository(db)
+        self.quiz = MongoQuizRepository(db)
+        self.reviews = MongoReviewRepository(db)
+        self.catalog = MongoCatalogRepository(db, read_preference=catalog_read_preference)
+
+    async def ensure_schema(self) -> None:
+        await ensure_indexes(self.db)
+
+    def schema_status(self) -> Dict[str, Any]:
+        return index_status
+
+    async def close(self) -> None:
+        self.client.close()
@@ -0,0 +1,551 @@
+# PostgreSQL storage engine (asyncpg)
+# users, tasting_notes and user_progress are the tables of netlify/schema.sql (plus the
+# columns the API needs), so the API and the Netlify functions can share a database. The
+# catalog is stored as JSONB documents: its shape is owned by the seed data, not by SQL.
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import asyncpg
+
+from catalog_cache import CATALOG_COLLECTIONS, CATALOG_META_ID
+from storage.base import (
+    CatalogRepository,
+    ProgressRepository,
+    QuizRepository,
+    ReviewRepository,
+    SessionRepository,
+    Storage,
+    TastingRepository,
+    UserRepository,
+)
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id SERIAL PRIMARY KEY,
+    user_id VARCHAR(50) UNIQUE NOT NULL,
+    email VARCHAR(255) UNIQUE NOT NULL,
+    password_hash VARCHAR(255),
+    name VARCHAR(255) NOT NULL,
+    picture TEXT,
+    preferred_language VARCHAR(10) DEFAULT 'pt',
+    google_id VARCHAR(255),
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS user_sessions (
+    session_token TEXT PRIMARY KEY,
+    user_id VARCHAR(50) NOT NULL REFERENCES users(user_id),
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_user ON user_sessions(user_id);
+
+CREATE TABLE IF NOT EXISTS tasting_notes (
+    id SERIAL PRIMARY KEY,
+    tasting_id VARCHAR(50) UNIQUE NOT NULL,
+    user_id VARCHAR(50) REFERENCES users(user_id),
+    wine_name VARCHAR(255) NOT NULL,
+    producer VARCHAR(255),
+    vintage INTEGER,
+    region TEXT,
+    grape_ids TEXT[],
+    region_id VARCHAR(100),
+    appearance JSONB DEFAULT '{}',
+    nose JSONB DEFAULT '{}',
+    palate JSONB DEFAULT '{}',
+    conclusion JSONB DEFAULT '{}',
+    notes TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+-- Newest-first keyset pagination of GET /tastings
+CREATE INDEX IF NOT EXISTS idx_tastings_user_created
+    ON tasting_notes(user_id, created_at DESC, tasting_id DESC);
+
+CREATE TABLE IF NOT EXISTS user_progress (
+    id SERIAL PRIMARY KEY,
+    user_id VARCHAR(50) UNIQUE REFERENCES users(user_id),
+    completed_lessons TEXT[] DEFAULT '{}',
+    quiz_scores JSONB DEFAULT '{}',
+    badges TEXT[] DEFAULT '{}',
+    total_tastings INTEGER DEFAULT 0,
+    current_streak INTEGER DEFAULT 0,
+    last_activity_date DATE
+);
+ALTER TABLE user_progress ADD COLUMN IF NOT EXISTS last_activity TIMESTAMP WITH TIME ZONE;
+ALTER TABLE user_progress ADD COLUMN IF NOT EXISTS recent_correct TEXT[] DEFAULT '{}';
+
+CREATE TABLE IF NOT EXISTS quiz_reviews (
+    user_id VARCHAR(50) NOT NULL REFERENCES users(user_id),
+    question_id TEXT NOT NULL,
+    track_id TEXT NOT NULL,
+    ease DOUBLE PRECISION NOT NULL,
+    interval_days INTEGER NOT NULL,
+    repetitions INTEGER NOT NULL,
+    lapses INTEGER NOT NULL DEFAULT 0,
+    due_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    last_reviewed_at TIMESTAMP WITH TIME ZONE,
+    PRIMARY KEY (user_id, question_id)
+);
+-- Due cards of a user, most overdue first
+CREATE INDEX IF NOT EXISTS idx_quiz_reviews_user_due ON quiz_reviews(user_id, due_at);
+
+CREATE TABLE IF NOT EXISTS catalog_documents (
+    collection TEXT NOT NULL,
+    key TEXT NOT NULL,
+    doc JSONB NOT NULL,
+    PRIMARY KEY (collection, key)
+);
+
+CREATE TABLE IF NOT EXISTS catalog_meta (
+    id TEXT PRIMARY KEY,
+    version TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS seed_manifest (
+    collection TEXT NOT NULL,
+    key TEXT NOT NULL,
+    source TEXT NOT NULL,
+    hash TEXT,
+    tombstone BOOLEAN NOT NULL DEFAULT FALSE,
+    PRIMARY KEY (collection, key)
+);
+"""
+
+USER_COLUMNS = ("user_id", "email", "password_hash", "name", "picture", "preferred_language", "created_at")
+TASTING_COLUMNS = (
+    "tasting_id", "user_id", "wine_name", "producer", "vintage", "region", "grape_ids", "region_id",
+    "appearance", "nose", "palate", "conclusion", "notes", "created_at",
+)
+REVIEW_COLUMNS = (
+    "user_id", "question_id", "track_id", "ease", "interval_days", "repetitions", "lapses", "due_at", "last_reviewed_at",
+)
+PROGRESS_COLUMNS = (
+    "user_id", "completed_lessons", "quiz_scores", "badges", "total_tastings", "current_streak", "last_activity",
+)
+
+
+def _timestamp(value: Any) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+
+def _document(record, columns: Iterable[str]) -> dict:
+    """Row as the document the Mongo engine would return: timestamps as ISO strings, no NULLs."""
+    doc = {}
+    for column in columns:
+        value = record[column]
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        if value is not None:
+            doc[column] = value
+    return doc
+
+
+async def _init_connection(connection) -> None:
+    for json_type in ("json", "jsonb"):
+        await connection.set_type_codec(json_type, encoder=json.dumps, decoder=json.loads, schema="pg_catalog")
+
+
+class _Database:
+    """Connection pool, created on first use (the storage is built before the event loop runs)."""
+
+    def __init__(self, dsn: str, min_size: int, max_size: int):
+        self._dsn = dsn
+        self._min_size = min_size
+        self._max_size = max_size
+        self._pool: Optional[asyncpg.Pool] = None
+        self._lock = asyncio.Lock()
+
+    async def pool(self) -> asyncpg.Pool:
+        if self._pool is None:
+            async with self._lock:
+                if self._pool is None:
+                    self._pool = await asyncpg.create_pool(
+                        self._dsn, min_size=self._min_size, max_size=self._max_size, init=_init_connection
+                    )
+        return self._pool
+
+    async def close(self) -> None:
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+
+class PostgresUserRepository(UserRepository):
+    def __init__(self, database: _Database):
+        self._database = database
+
+    async def _one(self, column: str, value: str) -> Optional[dict]:
+        pool = await self._database.pool()
+        record = await pool.fetchrow(f"SELECT {', '.join(USER_COLUMNS)} FROM users WHERE {column} = $1", value)
+        return _document(record, USER_COLUMNS) if record else None
+
+    async def get(self, user_id: str) -> Optional[dict]:
+        return await self._one("user_id", user_id)
+
+    async def get_by_email(self, email: str) -> Optional[dict]:
+        return await self._one("email", email)
+
+    async def create(self, user: dict) -> None:
+        values = [user.get(column) for column in USER_COLUMNS]
+        values[USER_COLUMNS.index("created_at")] = _timestamp(user["created_at"])
+        pool = await self._database.pool()
+        await pool.execute(
+            f"INSERT INTO users ({', '.join(USER_COLUMNS)}) "
+            f"VALUES ({', '.join(f'${i}' for i in range(1, len(USER_COLUMNS) + 1))})",
+            *values
+        )
+
+    async def update(self, user_id: str, fields: Dict[str, Any]) -> None:
+        columns = [column for column in fields if column in USER_COLUMNS and column != "user_id"]
+        if not columns:
+            return
+        assignments = ", ".join(f"{column} = ${i}" for i, column in enumerate(columns, start=2))
+        pool = await self._database.pool()
+        await pool.execute(
+            f"UPDATE users SET {assignments} WHERE user_id = $1", user_id, *(fields[c] for c in columns)
+        )
+
+
+class PostgresSessionRepository(SessionRepository):
+    def __init__(self, database: _Database):
+        self._database = database
+
+    async def get(self, session_token: str) -> Optional[dict]:
+        pool = await self._database.pool()
+        record = await pool.fetchrow(
+            "SELECT user_id, session_token, expires_at, created_at FROM user_sessions "
+            "WHERE session_token = $1 AND expires_at > NOW()",
+            session_token
+        )
+        if not record:
+            return None
+        return {**dict(record), "created_at": record["created_at"].isoformat()}
+
+    async def create(self, session: dict) -> None:
+        pool = await self._database.pool()
+        await pool.execute(
+            "INSERT INTO user_sessions (session_token, user_id, expires_at, created_at) VALUES ($1, $2, $3, $4)",
+            session["session_token"], session["user_id"], session["expires_at"], _timestamp(session["created_at"])
+        )
+
+    async def delete(self, session_token: str) -> None:
+        pool = await self._database.pool()
+        await pool.execute("DELETE FROM user_sessions WHERE session_token = $1", session_token)
+
+
+class PostgresTastingRepository(TastingRepository):
+    def __init__(self, database: _Database):
+        self._database = database
+
+    async def create(self, tasting: dict) -> None:
+        values = [tasting.get(column) for column in TASTING_COLUMNS]
+        values[TASTING_COLUMNS.index("created_at")] = _timestamp(tasting["created_at"])
+        pool = await self._database.pool()
+        await pool.execute(
+            f"INSERT INTO tasting_notes ({', '.join(TASTING_COLUMNS)}) "
+            f"VALUES ({', '.join(f'${i}' for i in range(1, len(TASTING_COLUMNS) + 1))})",
+            *values
+        )
+
+    async def get(self, user_id: str, tasting_id: str) -> Optional[dict]:
+        pool = await self._database.pool()
+        record = await pool.fetchrow(
+            f"SELECT {', '.join(TASTING_COLUMNS)} FROM tasting_notes WHERE tasting_id = $1 AND user_id = $2",
+            tasting_id, user_id
+        )
+        return _document(record, TASTING_COLUMNS) if record else None
+
+    async def delete(self, user_id: str, tasting_id: str) -> bool:
+        pool = await self._database.pool()
+        result = await pool.execute(
+            "DELETE FROM tasting_notes WHERE tasting_id = $1 AND user_id = $2", tasting_id, user_id
+        )
+        return result != "DELETE 0"
+
+    async def list(
+        self,
+        user_id: str,
+        limit: int,
+        after: Optional[Tuple[str, str]] = None,
+        grape_ids: Optional[List[str]] = None,
+        region_id: Optional[str] = None,
+        vintage_min: Optional[int] = None,
+        vintage_max: Optional[int] = None,
+        fields: Optional[Set[str]] = None
+    ) -> List[dict]:
+        columns = [c for c in TASTING_COLUMNS if c in fields] if fields else list(TASTING_COLUMNS)
+        conditions, args = ["user_id = $1"], [user_id]
+
+        def param(value) -> str:
+            args.append(value)
+            return f"${len(args)}"
+
+        if grape_ids:
+            conditions.append(f"grape_ids && {param(grape_ids)}::text[]")
+        if region_id:
+            conditions.append(f"region_id = {param(region_id)}")
+        if vintage_min is not None:
+            conditions.append(f"vintage >= {param(vintage_min)}")
+        if vintage_max is not None:
+            conditions.append(f"vintage <= {param(vintage_max)}")
+        if after:
+            created_at, tasting_id = after
+            conditions.append(f"(created_at, tasting_id) < ({param(_timestamp(created_at))}, {param(tasting_id)})")
+
+        pool = await self._database.pool()
+        records = await pool.fetch(
+            f"SELECT {', '.join(columns)} FROM tasting_notes WHERE {' AND '.join(conditions)} "
+            f"ORDER BY created_at DESC, tasting_id DESC LIMIT {param(limit)}",
+            *args
+        )
+        return [_document(record, columns) for record in records]
+
+
+class PostgresProgressRepository(ProgressRepository):
+    def __init__(self, database: _Database):
+        self._database = database
+
+    async def get(self, user_id: str) -> Optional[dict]:
+        pool = await self._database.pool()
+        record = await pool.fetchrow(
+            f"SELECT {', '.join(PROGRESS_COLUMNS)} FROM user_progress WHERE user_id = $1", user_id
+        )
+        return _document(record, PROGRESS_COLUMNS) if record else None
+
+    async def create(self, progress: dict) -> None:
+        values = [progress.get(column) for column in PROGRESS_COLUMNS]
+        values[PROGRESS_COLUMNS.index("last_activity")] = _timestamp(progress.get("last_activity"))
+        pool = await self._database.pool()
+        await pool.execute(
+            f"INSERT INTO user_progress ({', '.join(PROGRESS_COLUMNS)}) "
+            f"VALUES ({', '.join(f'${i}' for i in range(1, len(PROGRESS_COLUMNS) + 1))}) "
+            "ON CONFLICT (user_id) DO NOTHING",
+            *values
+        )
+
+    async def add_tastings(self, user_id: str, amount: int) -> None:
+        pool = await self._database.pool()
+        await pool.execute(
+            "UPDATE user_progress SET total_tastings = total_tastings + $2 WHERE user_id = $1", user_id, amount
+        )
+
+    async def complete_lesson(self, user_id: str, lesson_id: str, at: str) -> None:
+        pool = await self._database.pool()
+        await pool.execute(
+            "UPDATE user_progress SET last_activity = $3, completed_lessons = CASE "
+            "WHEN $2 = ANY(completed_lessons) THEN completed_lessons "
+            "ELSE array_append(completed_lessons, $2) END "
+            "WHERE user_id = $1",
+            user_id, lesson_id, _timestamp(at)
+        )
+
+
+class PostgresQuizRepository(QuizRepository):
+    def __init__(self, database: _Database):
+        self._database = database
+
+    async def add_scores(
+        self,
+        user_id: str,
+        scores: Dict[str, int],
+        recent_correct: Sequence[str] = (),
+        keep_recent: int = 50
+    ) -> None:
+        scores = {track_id: points for track_id, points in scores.items() if points}
+        recent_correct = list(recent_correct) if keep_recent > 0 else []
+        if not scores and not recent_correct:
+            return
+        pool = await self._database.pool()
+        # One statement, like Mongo's $inc and capped $push on one document
+        await pool.execute(
+            "UPDATE user_progress SET "
+            "quiz_scores = COALESCE(quiz_scores, '{}'::jsonb) || COALESCE(("
+            "  SELECT jsonb_object_agg(d.key, COALESCE((quiz_scores->>d.key)::int, 0) + d.value::int)"
+            "  FROM jsonb_each_text($2::jsonb) AS d"
+            "), '{}'::jsonb), "
+            "recent_correct = (COALESCE(recent_correct, '{}') || $3::text[])"
+            "[GREATEST(COALESCE(cardinality(recent_correct), 0) + cardinality($3::text[]) - $4 + 1, 1):] "
+            "WHERE user_id = $1",
+            user_id, scores, recent_correct, keep_recent
+        )
+
+    async def recent_correct(self, user_id: str) -> List[str]:
+        pool = await self._database.pool()
+        recent = await pool.fetchval("SELECT recent_correct FROM user_progress WHERE user_id = $1", user_id)
+        return list(recent or [])
+
+
+class PostgresReviewRepository(ReviewRepository):
+    def __init__(self, database: _Database):
+        self._database = database
+
+    async def get_many(self, user_id: str, question_ids: Iterable[str]) -> Dict[str, dict]:
+        pool = await self._database.pool()
+        records = await pool.fetch(
+            f"SELECT {', '.join(REVIEW_COLUMNS)} FROM quiz_reviews WHERE user_id = $1 AND question_id = ANY($2::text[])",
+            user_id, list(question_ids)
+        )
+        return {record["question_id"]: dict(record) for record in records}
+
+    async def save_many(self, states: List[dict]) -> None:
+        if not states:
+            return
+        updates = ", ".join(f"{column} = EXCLUDED.{column}" for column in REVIEW_COLUMNS[2:])
+        pool = await self._database.pool()
+        await pool.executemany(
+            f"INSERT INTO quiz_reviews ({', '.join(REVIEW_COLUMNS)}) "
+            f"VALUES ({', '.join(f'${i}' for i in range(1, len(REVIEW_COLUMNS) + 1))}) "
+            f"ON CONFLICT (user_id, question_id) DO UPDATE SET {updates}",
+            [tuple(state[column] for column in REVIEW_COLUMNS) for state in states]
+        )
+
+    async def due(self, user_id: str, now: datetime, limit: int, track_id: Optional[str] = None) -> List[dict]:
+        pool = await self._database.pool()
+        records = await pool.fetch(
+            f"SELECT {', '.join(REVIEW_COLUMNS)} FROM quiz_reviews "
+            "WHERE user_id = $1 AND due_at <= $2 AND ($3::text IS NULL OR track_id = $3) "
+            "ORDER BY due_at, question_id LIMIT $4",
+            user_id, now, track_id, limit
+        )
+        return [dict(record) for record in records]
+
+    async def count_due(self, user_id: str, now: datetime, track_id: Optional[str] = None) -> int:
+        pool = await self._database.pool()
+        return await pool.fetchval(
+            "SELECT count(*) FROM quiz_reviews WHERE user_id = $1 AND due_at <= $2 AND ($3::text IS NULL OR track_id = $3)",
+            user_id, now, track_id
+        )
+
+
+class PostgresCatalogRepository(CatalogRepository):
+    def __init__(self, database: _Database):
+        self._database = database
+
+    async def load_if_changed(self, known_version: Optional[str]) -> Tuple[str, Optional[Dict[str, List[dict]]]]:
+        pool = await self._database.pool()
+        async with pool.acquire() as connection:
+            # First run against an existing database: create the version row
+            await connection.execute(
+                "INSERT INTO catalog_meta (id, version) VALUES ($1, $2) ON CONFLICT (id) DO NOTHING",
+                CATALOG_META_ID, uuid.uuid4().hex
+            )
+            # One snapshot for the version and the documents
+            async with connection.transaction(isolation="repeatable_read", readonly=True):
+                version = await connection.fetchval("SELECT version FROM catalog_meta WHERE id = $1", CATALOG_META_ID)
+                if version == known_version:
+                    return version, None
+                records = await connection.fetch("SELECT collection, doc FROM catalog_documents ORDER BY collection, key")
+        collections = {name: [] for name in CATALOG_COLLECTIONS}
+        for record in records:
+            if record["collection"] in collections:
+                collections[record["collection"]].append(record["doc"])
+        return version, collections
+
+    async def set_version(self, version: str) -> None:
+        pool = await self._database.pool()
+        await pool.execute(
+            "INSERT INTO catalog_meta (id, version) VALUES ($1, $2) ON CONFLICT (id) DO UPDATE SET version = EXCLUDED.version",
+            CATALOG_META_ID, version
+        )
+
+    async def documents(self, collection: str) -> List[dict]:
+        pool = await self._database.pool()
+        return [
+            record["doc"]
+            for record in await pool.fetch("SELECT doc FROM catalog_documents WHERE collection = $1", collection)
+        ]
+
+    async def manifest(self, collection: str, source: Optional[str] = None) -> List[dict]:
+        pool = await self._database.pool()
+        records = await pool.fetch(
+            "SELECT collection, key, source, hash, tombstone FROM seed_manifest "
+            "WHERE collection = $1 AND ($2::text IS NULL OR source = $2)",
+            collection, source
+        )
+        return [dict(record) for record in records]
+
+    async def apply_seed(
+        self,
+        collection: str,
+        upserts: List[dict],
+        deletes: Iterable[str],
+        manifest_entries: List[dict]
+    ) -> None:
+        key_field = CATALOG_COLLECTIONS[collection]
+        pool = await self._database.pool()
+        async with pool.acquire() as connection, connection.transaction():
+            if upserts:
+                await connection.executemany(
+                    "INSERT INTO catalog_documents (collection, key, doc) VALUES ($1, $2, $3) "
+                    "ON CONFLICT (collection, key) DO UPDATE SET doc = EXCLUDED.doc",
+                    [(collection, doc[key_field], doc) for doc in upserts]
+                )
+            deletes = list(deletes)
+            if deletes:
+                await connection.execute(
+                    "DELETE FROM catalog_documents WHERE collection = $1 AND key = ANY($2::text[])", collection, deletes
+                )
+            if manifest_entries:
+                await connection.executemany(
+                    "INSERT INTO seed_manifest (collection, key, source, hash, tombstone) VALUES ($1, $2, $3, $4, $5) "
+                    "ON CONFLICT (collection, key) DO UPDATE SET "
+                    "source = EXCLUDED.source, hash = EXCLUDED.hash, tombstone = EXCLUDED.tombstone",
+                    [
+                        (collection, entry["key"], entry["source"], entry["hash"], entry["tombstone"])
+                        for entry in manifest_entries
+                    ]
+                )
+
+    async def refresh_lesson_counts(self) -> None:
+        pool = await self._database.pool()
+        await pool.execute(
+            "UPDATE catalog_documents AS t SET doc = jsonb_set(t.doc, '{lessons_count}', to_jsonb(c.count)) "
+            "FROM (SELECT doc->>'track_id' AS track_id, count(*) AS count FROM catalog_documents "
+            "      WHERE collection = 'lessons' GROUP BY 1) AS c "
+            "WHERE t.collection = 'study_tracks' AND t.key = c.track_id"
+        )
+
+
+class PostgresStorage(Storage):
+    name = "postgres"
+
+    def __init__(self, dsn: str, min_size: int = 1, max_size: int = 10):
+        self._database = _Database(dsn, min_size, max_size)
+        self.users = PostgresUserRepository(self._database)
+        self.sessions = PostgresSessionRepository(self._database)
+        self.tastings = PostgresTastingRepository(self._database)
+        self.progress = PostgresProgressRepository(self._database)
+        self.quiz = PostgresQuizRepository(self._database)
+        self.reviews = PostgresReviewRepository(self._database)
+        self.catalog = PostgresCatalogRepository(self._database)
+        self._schema_status: Dict[str, Any] = {"state": "pending", "indexes": []}
+
+    async def ensure_schema(self) -> None:
+        started = time.perf_counter()
+        self._schema_status = {"state": "building", "indexes": []}
+        try:
+            pool = await self._database.pool()
+            await pool.execute(SCHEMA)
+        except (OSError, asyncpg.PostgresError) as e:
+            self._schema_status = {"state": "failed", "error": str(e), "indexes": []}
+            logger.error(f"PostgreSQL schema setup failed: {e}")
+            return
+        self._schema_status = {
+            "state": "ready",
+            "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+            "indexes": [],
+        }
+
+    def schema_status(self) -> Dict[str, Any]:
+        return self._schema_status
+
+    async def close(self) -> None:
+        await self._database.close()
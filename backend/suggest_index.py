@@ -0,0 +1,144 @@
+# As-you-type suggestions for grape, region and aroma pickers
+# A prefix trie answers exact prefixes; a trigram index catches typos ("shirz" -> Shiraz).
+
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from search_engine import fold
+
+# Entries kept per trie node and kind; enough for any sensible top-k, even with ?kind=
+MAX_NODE_ENTRIES = 20
+# Share of the query's trigrams a term must contain to count as a fuzzy match
+MIN_TRIGRAM_SCORE = 0.5
+# Shorter queries share too few trigrams for fuzzy matching to be meaningful
+MIN_FUZZY_QUERY_LENGTH = 4
+KIND_ORDER = {"grape": 0, "region": 1, "aroma": 2}
+
+
+def _trigrams(text: str) -> set:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class _TrieNode:
+    __slots__ = ("children", "entries", "kind_counts")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.entries: List[int] = []
+        self.kind_counts: Dict[str, int] = defaultdict(int)
+
+
+class SuggestIndex:
+    """Entries are (kind, id, labels by language, searchable terms).
+
+    Each term is reachable from its start and from the start of each of its words, so
+    "noir" suggests "Pinot Noir" and "shiraz" suggests "Syrah / Shiraz".
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, str, Dict[str, str], List[str]]]):
+        # Best entries first, so every trie node keeps its top MAX_NODE_ENTRIES
+        self.entries = sorted(
+            entries,
+            key=lambda e: (KIND_ORDER.get(e[0], len(KIND_ORDER)), len(e[2].get("en", "")), e[1])
+        )
+        self._root = _TrieNode()
+        self._terms: List[Tuple[int, str]] = []
+        self._trigrams: Dict[str, List[int]] = defaultdict(list)
+
+        for position, (_, _, _, terms) in enumerate(self.entries):
+            for term in {fold(t).strip() for t in terms if t}:
+                term_position = len(self._terms)
+                self._terms.append((position, term))
+                for gram in _trigrams(term):
+                    self._trigrams[gram].append(term_position)
+                words = term.split()
+                for start in range(len(words)):
+                    self._insert(" ".join(words[start:]), position)
+
+    def _insert(self, key: str, position: int) -> None:
+        kind = self.entries[position][0]
+        node = self._root
+        for char in key:
+            node = node.children.setdefault(char, _TrieNode())
+            if node.kind_counts[kind] < MAX_NODE_ENTRIES and position not in node.entries:
+                node.entries.append(position)
+                node.kind_counts[kind] += 1
+
+    def _prefix(self, prefix: str) -> List[int]:
+        node = self._root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return node.entries
+
+    def _fuzzy(self, query: str) -> List[int]:
+        grams = _trigrams(query)
+        counts: Dict[int, int] = defaultdict(int)
+        for gram in grams:
+            for term_position in self._trigrams.get(gram, ()):
+                counts[term_position] += 1
+
+        best: Dict[int, Tuple[float, int]] = {}
+        for term_position, shared in counts.items():
+            score = shared / len(grams)
+            if score < MIN_TRIGRAM_SCORE:
+                continue
+            position, term = self._terms[term_position]
+            rank = (score, -abs(len(term) - len(query)))
+            if position not in best or rank > best[position]:
+                best[position] = rank
+        return sorted(best, key=lambda position: best[position], reverse=True)
+
+    def suggest(
+        self,
+        query: str,
+        limit: int = 8,
+        kinds: Optional[Iterable[str]] = None,
+        budget_ms: float = 5.0
+    ) -> Tuple[List[Tuple[str, str, Dict[str, str]]], bool]:
+        """Return ([(kind, id, labels)], complete); fuzzy matching is skipped once over budget."""
+        deadline = time.perf_counter() + budget_ms / 1000
+        allowed = set(kinds) if kinds else None
+        query = " ".join(fold(query).split())
+        if not query:
+            return [], True
+
+        results: List[int] = []
+
+        def take(positions: Iterable[int]) -> None:
+            for position in positions:
+                if len(results) >= limit:
+                    return
+                if position in results:
+                    continue
+                if allowed and self.entries[position][0] not in allowed:
+                    continue
+                results.append(position)
+
+        take(self._prefix(query))
+        complete = True
+        if len(results) < limit and len(query) >= MIN_FUZZY_QUERY_LENGTH:
+            if time.perf_counter() < deadline:
+                take(self._fuzzy(query))
+            else:
+                complete = False
+        return [self.entries[p][:3] for p in results], complete
+
+
+def build_suggest_index(snapshot) -> SuggestIndex:
+    """Grapes (every "A / B" alias), regions in both languages and aromas from a CatalogSnapshot."""
+    entries = []
+    for grape in snapshot.all("grapes"):
+        aliases = [part.strip() for part in grape["name"].split("/")]
+        entries.append(("grape", grape["grape_id"], {"pt": grape["name"], "en": grape["name"]}, [grape["name"], *aliases]))
+    for region in snapshot.all("regions"):
+        name = region.get("name", "")
+        labels = {"pt": region.get("name_pt") or name, "en": region.get("name_en") or name}
+        entries.append(("region", region["region_id"], labels, [name, labels["pt"], labels["en"]]))
+    for aroma in snapshot.all("aroma_tags"):
+        labels = {"pt": aroma.get("name_pt", ""), "en": aroma.get("name_en", "")}
+        entries.append(("aroma", aroma["tag_id"], labels, [labels["pt"], labels["en"]]))
+    return SuggestIndex(entries)
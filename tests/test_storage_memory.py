@@ -0,0 +1,173 @@
+"""
+Storage layer tests - run in-process against the in-memory engine
+Tests for: tasting pagination, quiz scores, review scheduling and seeding
+"""
+import asyncio
+import os
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+os.environ["STORAGE_BACKEND"] = "memory"
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import server  # noqa: E402
+from storage.memory import MemoryStorage  # noqa: E402
+
+NOW = datetime(2026, 1, 15, 12, 0, tzinfo=timezone.utc)
+TASTING = {
+    "vintage": 2019,
+    "grape_ids": ["merlot"],
+    "appearance": {"intensity": "deep", "color": "ruby"},
+    "nose": {"condition": "clean", "intensity": "medium", "aromas": ["Plum"]},
+    "palate": {"sweetness": "dry", "acidity": "medium", "tannin": "medium", "body": "full", "alcohol": "medium", "flavors": ["Plum"], "finish": "long"},
+    "conclusion": {"quality": "good", "aging_potential": "can_age", "readiness": "drink_now"}
+}
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(server.app) as client:
+        yield client
+
+
+@pytest.fixture
+def auth_headers(client):
+    email = f"test_{uuid.uuid4().hex[:8]}@example.com"
+    client.post("/api/auth/register", json={"email": email, "password": "secret123", "name": "Test User"})
+    token = client.post("/api/auth/login", json={"email": email, "password": "secret123"}).json()["token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def storage():
+    return MemoryStorage()
+
+
+class TestTastingRepository:
+    """Tests for tastings.list keyset pagination and projection"""
+
+    def _create(self, storage, user_id, count, created_at="2026-01-01T00:00:00+00:00"):
+        # Same created_at for every tasting: pages must still split on tasting_id
+        for i in range(count):
+            run(storage.tastings.create({
+                "tasting_id": f"tasting_{i:02d}", "user_id": user_id, "wine_name": f"Wine {i}",
+                "vintage": 2010 + i, "grape_ids": ["merlot"], "created_at": created_at
+            }))
+
+    def test_pages_follow_keyset_without_gaps_or_repeats(self, storage):
+        """Verify walking pages with the last (created_at, tasting_id) returns every tasting once"""
+        self._create(storage, "user_a", 7)
+        seen, after = [], None
+        while True:
+            page = run(storage.tastings.list("user_a", 3, after=after))
+            if not page:
+                break
+            seen.extend(t["tasting_id"] for t in page)
+            after = (page[-1]["created_at"], page[-1]["tasting_id"])
+        assert seen == [f"tasting_{i:02d}" for i in reversed(range(7))]
+
+    def test_list_is_scoped_to_the_user(self, storage):
+        """Verify another user's tastings are never listed"""
+        self._create(storage, "user_a", 2)
+        assert run(storage.tastings.list("user_b", 10)) == []
+
+    def test_projection_returns_only_requested_fields(self, storage):
+        """Verify fields limits the returned keys"""
+        self._create(storage, "user_a", 2)
+        page = run(storage.tastings.list("user_a", 10, fields={"wine_name", "tasting_id"}))
+        assert [set(t) for t in page] == [{"wine_name", "tasting_id"}] * 2
+
+    def test_api_cursor_walks_every_tasting(self, client, auth_headers):
+        """Verify GET /api/tastings pages through X-Next-Cursor with a projection"""
+        for i in range(5):
+            response = client.post("/api/tastings", headers=auth_headers, json={**TASTING, "wine_name": f"Wine {i}"})
+            assert response.status_code == 201
+        names, cursor = [], None
+        while True:
+            params = {"limit": 2, "fields": "wine_name"}
+            if cursor:
+                params["cursor"] = cursor
+            response = client.get("/api/tastings", headers=auth_headers, params=params)
+            assert response.status_code == 200
+            assert all("vintage" not in t for t in response.json())
+            names.extend(t["wine_name"] for t in response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+        assert sorted(names) == [f"Wine {i}" for i in range(5)]
+
+
+class TestQuizRepository:
+    """Tests for quiz.add_scores"""
+
+    def test_scores_accumulate_per_track(self, storage):
+        """Verify score deltas add up per track"""
+        run(storage.progress.create({"user_id": "user_a", "quiz_scores": {}, "completed_lessons": []}))
+        run(storage.quiz.add_scores("user_a", {"basic": 2, "advanced": 1}))
+        run(storage.quiz.add_scores("user_a", {"basic": 3}))
+        assert run(storage.progress.get("user_a"))["quiz_scores"] == {"basic": 5, "advanced": 1}
+
+    def test_recent_correct_keeps_only_the_latest(self, storage):
+        """Verify recent_correct is capped at keep_recent, newest kept"""
+        run(storage.progress.create({"user_id": "user_a", "quiz_scores": {}, "completed_lessons": []}))
+        run(storage.quiz.add_scores("user_a", {"basic": 3}, recent_correct=["q1", "q2", "q3"], keep_recent=4))
+        run(storage.quiz.add_scores("user_a", {"basic": 2}, recent_correct=["q4", "q5"], keep_recent=4))
+        assert run(storage.quiz.recent_correct("user_a")) == ["q2", "q3", "q4", "q5"]
+
+
+class TestReviewRepository:
+    """Tests for reviews.due / count_due"""
+
+    def _state(self, question_id, due_in_hours, track_id="basic"):
+        return {
+            "user_id": "user_a", "question_id": question_id, "track_id": track_id, "ease": 2.5,
+            "interval_days": 1, "repetitions": 1, "lapses": 0,
+            "due_at": NOW + timedelta(hours=due_in_hours), "last_reviewed_at": NOW
+        }
+
+    def test_due_is_ordered_most_overdue_first(self, storage):
+        """Verify only due states are returned, earliest due_at first, up to limit"""
+        run(storage.reviews.save_many([
+            self._state("q1", -1), self._state("q2", -48), self._state("q3", 5), self._state("q4", -3)
+        ]))
+        assert [s["question_id"] for s in run(storage.reviews.due("user_a", NOW, 10))] == ["q2", "q4", "q1"]
+        assert [s["question_id"] for s in run(storage.reviews.due("user_a", NOW, 2))] == ["q2", "q4"]
+        assert run(storage.reviews.count_due("user_a", NOW)) == 3
+
+    def test_saving_again_reschedules(self, storage):
+        """Verify a re-saved state moves to its new due date"""
+        run(storage.reviews.save_many([self._state("q1", -1), self._state("q2", -2)]))
+        run(storage.reviews.save_many([self._state("q2", 24)]))
+        assert [s["question_id"] for s in run(storage.reviews.due("user_a", NOW, 10))] == ["q1"]
+        assert run(storage.reviews.count_due("user_a", NOW + timedelta(days=2))) == 2
+
+    def test_due_filters_by_track(self, storage):
+        """Verify track_id restricts both the cards and the count"""
+        run(storage.reviews.save_many([
+            self._state("q1", -1), self._state("adv_q1", -2, track_id="advanced")
+        ]))
+        assert [s["question_id"] for s in run(storage.reviews.due("user_a", NOW, 10, "advanced"))] == ["adv_q1"]
+        assert run(storage.reviews.count_due("user_a", NOW, "basic")) == 1
+
+
+class TestSeeding:
+    """Tests for the diff-based /api/seed* endpoints"""
+
+    def test_second_seed_writes_nothing(self, client):
+        """Verify reseeding unchanged data reports zero inserts, updates and deletes"""
+        client.post("/api/seed")
+        response = client.post("/api/seed")
+        assert response.status_code == 200
+        for collection, changes in response.json()["changes"].items():
+            assert changes["inserted"] == changes["updated"] == changes["deleted"] == 0, collection
+            assert changes["unchanged"] > 0, collection
@@ -71,7 +71,27 @@ class TestGrapesAPI:
         assert grape["origin_country"] == "france"
         assert "aromatic_notes" in grape
         assert "structure" in grape
-    
+
+    def test_grapes_served_compressed_when_accepted(self):
+        """Verify the pre-encoded gzip variant decodes to the same payload"""
+        plain = requests.get(f"{BASE_URL}/api/grapes", headers={"Accept-Encoding": "identity"})
+        compressed = requests.get(f"{BASE_URL}/api/grapes", headers={"Accept-Encoding": "gzip"})
+        assert compressed.status_code == 200
+        assert compressed.headers.get("Content-Encoding") == "gzip"
+        assert "Accept-Encoding" in compressed.headers.get("Vary", "")
+        assert compressed.json() == plain.json()
+
+    def test_grapes_revalidate_with_etag(self):
+        """Verify If-None-Match with the returned ETag gets an empty 304"""
+        response = requests.get(f"{BASE_URL}/api/grapes", params={"lang": "en"})
+        assert response.status_code == 200
+        etag = response.headers.get("ETag")
+        assert etag
+        assert "max-age" in response.headers.get("Cache-Control", "")
+        revalidated = requests.get(f"{BASE_URL}/api/grapes", params={"lang": "en"}, headers={"If-None-Match": etag})
+        assert revalidated.status_code == 304
+        assert revalidated.content == b""
+
     def test_get_nonexistent_grape_returns_404(self):
         """Verify 404 for non-existent grape"""
         response = requests.get(f"{BASE_URL}/api/grapes/nonexistent_grape")
@@ -230,6 +250,44 @@ class TestTastingsAPI:
         )
         assert response.status_code == 404
 
+    def test_get_tastings_paginates_with_cursor(self, auth_headers):
+        """Verify GET /api/tastings pages newest-first via X-Next-Cursor without repeats"""
+        first = requests.get(f"{BASE_URL}/api/tastings", headers=auth_headers, params={"limit": 1})
+        assert first.status_code == 200
+        assert len(first.json()) <= 1
+        cursor = first.headers.get("X-Next-Cursor")
+        if not cursor:
+            pytest.skip("Test user has fewer than 2 tastings")
+
+        second = requests.get(
+            f"{BASE_URL}/api/tastings",
+            headers=auth_headers,
+            params={"limit": 1, "cursor": cursor}
+        )
+        assert second.status_code == 200
+        assert len(second.json()) == 1
+        assert second.json()[0]["tasting_id"] != first.json()[0]["tasting_id"]
+        assert second.json()[0]["created_at"] <= first.json()[0]["created_at"]
+
+    def test_get_tastings_field_projection(self, auth_headers):
+        """Verify fields= returns only the requested fields plus the pagination key"""
+        response = requests.get(
+            f"{BASE_URL}/api/tastings",
+            headers=auth_headers,
+            params={"fields": "wine_name,vintage"}
+        )
+        assert response.status_code == 200
+        for tasting in response.json():
+            assert set(tasting) <= {"tasting_id", "created_at", "wine_name", "vintage"}
+            assert "nose" not in tasting
+
+    def test_get_tastings_rejects_invalid_cursor_and_fields(self, auth_headers):
+        """Verify malformed cursors and unknown fields return 400"""
+        response = requests.get(f"{BASE_URL}/api/tastings", headers=auth_headers, params={"cursor": "not-a-cursor"})
+        assert response.status_code == 400
+        response = requests.get(f"{BASE_URL}/api/tastings", headers=auth_headers, params={"fields": "password_hash"})
+        assert response.status_code == 400
+
 
 class TestAromasAPI:
     """Tests for /api/aromas endpoints"""
@@ -405,6 +463,36 @@ class TestRegionDetailAPI:
         # Key grapes
         assert "Cabernet Sauvignon" in region["key_grapes"]
     
+    def test_get_region_scoped_to_one_language(self):
+        """Verify lang=en drops every _pt field, including nested terroir/climate fields"""
+        response = requests.get(f"{BASE_URL}/api/regions/bordeaux", params={"lang": "en"})
+        assert response.status_code == 200
+        region = response.json()
+
+        assert region["name_en"] == "Bordeaux"
+        assert "Gravel" in region["terroir"]["soil_en"]
+        assert "Oceanic" in region["climate"]["type_en"]
+        assert "name_pt" not in region
+        assert "description_pt" not in region
+        assert "soil_pt" not in region["terroir"]
+        assert "type_pt" not in region["climate"]
+
+    def test_signed_in_request_without_lang_gets_both_languages(self):
+        """Verify the stored language preference does not scope catalog payloads"""
+        response = requests.get(
+            f"{BASE_URL}/api/regions/bordeaux",
+            headers={"Authorization": f"Bearer {TEST_SESSION_TOKEN}"}
+        )
+        assert response.status_code == 200
+        region = response.json()
+        assert "name_pt" in region and "name_en" in region
+        assert response.headers["Cache-Control"].startswith("public")
+
+    def test_invalid_language_returns_422(self):
+        """Verify only pt/en are accepted for lang"""
+        response = requests.get(f"{BASE_URL}/api/regions", params={"lang": "fr"})
+        assert response.status_code == 422
+
     def test_get_nonexistent_region_returns_404(self):
         """Verify 404 for non-existent region"""
         response = requests.get(f"{BASE_URL}/api/regions/nonexistent_region")
@@ -434,5 +522,133 @@ class TestRegionDetailAPI:
             assert len(region["key_grapes"]) > 0, f"Region {region['region_id']} has empty key_grapes"
 
 
+class TestSearchAPI:
+    """Tests for /api/search ranked full-text search"""
+
+    def test_search_is_accent_insensitive(self):
+        """Verify 'Semillon' finds the Sémillon grape"""
+        response = requests.get(f"{BASE_URL}/api/search", params={"q": "Semillon"})
+        assert response.status_code == 200
+        result = response.json()
+        assert any(hit["type"] == "grape" and hit["id"] == "semillon" for hit in result["hits"])
+
+    def test_search_hits_are_ranked_and_paginated(self):
+        """Verify hits are sorted by score and limit/offset page through them"""
+        response = requests.get(f"{BASE_URL}/api/search", params={"q": "pinot", "limit": 3})
+        assert response.status_code == 200
+        result = response.json()
+        scores = [hit["score"] for hit in result["hits"]]
+        assert len(scores) <= 3
+        assert scores == sorted(scores, reverse=True)
+
+        second = requests.get(f"{BASE_URL}/api/search", params={"q": "pinot", "limit": 3, "offset": 3}).json()
+        first_ids = {hit["id"] for hit in result["hits"]}
+        assert not first_ids & {hit["id"] for hit in second["hits"]}
+
+    def test_search_treats_input_literally(self):
+        """Verify regex metacharacters are not interpreted"""
+        response = requests.get(f"{BASE_URL}/api/search", params={"q": ".*("})
+        assert response.status_code == 200
+        assert response.json()["total"] == 0
+
+
+class TestSuggestAPI:
+    """Tests for /api/suggest autocomplete"""
+
+    def test_suggest_matches_grape_alias_prefix(self):
+        """Verify 'shir' suggests Syrah / Shiraz"""
+        response = requests.get(f"{BASE_URL}/api/suggest", params={"q": "shir"})
+        assert response.status_code == 200
+        ids = [s["id"] for s in response.json()["suggestions"]]
+        assert "syrah" in ids
+
+    def test_suggest_tolerates_typos(self):
+        """Verify a misspelled 'cabernt sauvignon' still finds Cabernet Sauvignon"""
+        response = requests.get(f"{BASE_URL}/api/suggest", params={"q": "cabernt sauvignon", "kind": "grape"})
+        assert response.status_code == 200
+        suggestions = response.json()["suggestions"]
+        assert any(s["id"] == "cabernet_sauvignon" for s in suggestions)
+        assert all(s["type"] == "grape" for s in suggestions)
+
+    def test_suggest_region_label_in_requested_language(self):
+        """Verify region labels follow lang"""
+        response = requests.get(f"{BASE_URL}/api/suggest", params={"q": "rod", "kind": "region", "lang": "pt"})
+        assert response.status_code == 200
+        assert {"type": "region", "id": "rhone", "label": "Ródano"} in response.json()["suggestions"]
+
+
+class TestQuizAPI:
+    """Tests for /api/quiz endpoints"""
+
+    @pytest.fixture
+    def auth_headers(self):
+        return {"Authorization": f"Bearer {TEST_SESSION_TOKEN}"}
+
+    def test_questions_sample_is_reproducible_with_seed(self):
+        """Verify a seeded draw repeats and spreads across the track's lessons"""
+        params = {"limit": 5, "seed": 42}
+        first = requests.get(f"{BASE_URL}/api/quiz/tracks/basic/questions", params=params)
+        second = requests.get(f"{BASE_URL}/api/quiz/tracks/basic/questions", params=params)
+        assert first.status_code == 200
+        ids = [q["question_id"] for q in first.json()]
+        assert ids == [q["question_id"] for q in second.json()]
+        assert len(set(ids)) == len(ids) == 5
+        assert len({q.get("lesson_id") for q in first.json()}) == 5
+
+    def test_advanced_questions_sample_covers_lessons(self):
+        """Verify advanced questions are tied to lessons, so a draw spreads across them"""
+        response = requests.get(f"{BASE_URL}/api/quiz/tracks/advanced/questions", params={"limit": 6, "seed": 7})
+        assert response.status_code == 200
+        lessons = [q.get("lesson_id") for q in response.json()]
+        assert None not in lessons
+        assert len(set(lessons)) == 6
+
+    def test_submit_batch_grades_every_answer(self, auth_headers):
+        """Verify POST /api/quiz/submit-batch returns per-question results and a summary"""
+        questions = requests.get(f"{BASE_URL}/api/quiz/tracks/basic/questions", params={"limit": 4}).json()
+        answers = [
+            {"question_id": q["question_id"], "selected_answer": q["correct_answer"] if i % 2 == 0 else -1}
+            for i, q in enumerate(questions)
+        ]
+        response = requests.post(f"{BASE_URL}/api/quiz/submit-batch", headers=auth_headers, json={"answers": answers})
+        assert response.status_code == 200
+        data = response.json()
+        assert [r["correct"] for r in data["results"]] == [i % 2 == 0 for i in range(len(questions))]
+        assert data["summary"]["answered"] == len(questions)
+        assert data["summary"]["correct"] == (len(questions) + 1) // 2
+
+    def test_submit_batch_rejects_unknown_questions(self, auth_headers):
+        """Verify an attempt with an unknown question id returns 404"""
+        response = requests.post(
+            f"{BASE_URL}/api/quiz/submit-batch",
+            headers=auth_headers,
+            json={"answers": [{"question_id": "nonexistent_question", "selected_answer": 0}]}
+        )
+        assert response.status_code == 404
+
+    def test_submit_batch_rejects_duplicate_questions(self, auth_headers):
+        """Verify an attempt answering the same question twice returns 422"""
+        question = requests.get(f"{BASE_URL}/api/quiz/tracks/basic/questions", params={"limit": 1}).json()[0]
+        answer = {"question_id": question["question_id"], "selected_answer": question["correct_answer"]}
+        response = requests.post(
+            f"{BASE_URL}/api/quiz/submit-batch", headers=auth_headers, json={"answers": [answer, answer]}
+        )
+        assert response.status_code == 422
+
+    def test_review_requires_auth(self):
+        """Verify GET /api/quiz/review without auth returns 401"""
+        response = requests.get(f"{BASE_URL}/api/quiz/review")
+        assert response.status_code == 401
+
+    def test_review_returns_due_cards(self, auth_headers):
+        """Verify GET /api/quiz/review returns at most limit cards, most overdue first"""
+        response = requests.get(f"{BASE_URL}/api/quiz/review", headers=auth_headers, params={"limit": 5})
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["cards"]) <= min(5, data["due"])
+        due_dates = [card["review"]["due_at"] for card in data["cards"]]
+        assert due_dates == sorted(due_dates)
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])